@@ -1,27 +1,45 @@
 """Better Git Diff - A library for extracting function-level diffs from git repositories."""
 
-from .git_operations import clone_repository, get_commit_diff
-from .python_function_detector import PythonFunctionDetector, PythonFunction, detect_python_functions_in_file
+from .git_operations import clone_repository, get_commit_diff, iter_commit_diff_lines
+from .python_function_detector import (
+    PythonFunctionDetector,
+    PythonFunction,
+    detect_python_functions_in_file,
+    detect_python_functions_in_files,
+    detect_python_functions_in_files_async
+)
 from .function_aware_diff import (
     FunctionAwareDiffParser, 
     FunctionChange, 
     EnhancedFileChange,
-    parse_git_diff_with_functions
+    parse_git_diff_with_functions,
+    reset_default_parser,
+    ADDED,
+    MODIFIED,
+    DELETED
 )
-from .diff_parser import FileChange, DiffHunk, parse_diff_output
+from .diff_parser import FileChange, DiffHunk, parse_diff_output, parse_diff_stream
 
 __version__ = "0.1.0"
 __all__ = [
     "clone_repository",
     "get_commit_diff", 
+    "iter_commit_diff_lines",
     "PythonFunctionDetector",
     "PythonFunction",
     "detect_python_functions_in_file",
+    "detect_python_functions_in_files",
+    "detect_python_functions_in_files_async",
     "FunctionAwareDiffParser",
     "FunctionChange", 
     "EnhancedFileChange",
     "parse_git_diff_with_functions",
+    "reset_default_parser",
+    "ADDED",
+    "MODIFIED",
+    "DELETED",
     "FileChange",
     "DiffHunk", 
-    "parse_diff_output"
+    "parse_diff_output",
+    "parse_diff_stream"
 ]
\ No newline at end of file
@@ -1,11 +1,25 @@
 """Base diff parser for parsing git diff output."""
 
-from dataclasses import dataclass, field
-from typing import List, Optional
 import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple, Union
+
+
+_DIFF_GIT_PREFIX = b'diff --git '
+
+# C-style escapes git uses in quoted paths, e.g. "a/tab\there"
+_PATH_ESCAPES = {
+    ord('a'): 7, ord('b'): 8, ord('t'): 9, ord('n'): 10, ord('v'): 11,
+    ord('f'): 12, ord('r'): 13, ord('"'): 34, ord('\\'): 92
+}
+
+_CONTENT_PREFIXES = (b'+', b'-', b' ')
 
+# "@@ -old_start[,old_count] +new_start[,new_count] @@"; combined (@@@) headers don't match
+_HUNK_HEADER_RE = re.compile(rb'@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
 
-@dataclass
+
+@dataclass(slots=True)
 class DiffHunk:
     """Represents a hunk of changes within a file."""
     old_start: int
@@ -13,9 +27,11 @@ class DiffHunk:
     new_start: int
     new_count: int
     lines: List[str] = field(default_factory=list)
+    added_count: int = 0    # Number of '+' lines, counted while parsing
+    removed_count: int = 0  # Number of '-' lines, counted while parsing
 
 
-@dataclass
+@dataclass(slots=True)
 class FileChange:
     """Represents changes to a single file in a diff."""
     old_file: str
@@ -23,59 +39,168 @@ class FileChange:
     hunks: List[DiffHunk] = field(default_factory=list)
 
 
-def parse_diff_output(diff_text: str) -> List[FileChange]:
+def _decode(data: bytes) -> str:
+    """Decode a piece of diff output, keeping undecodable bytes round-trippable."""
+    return data.decode('utf-8', errors='surrogateescape')
+
+
+def _parse_hunk_header(line: bytes) -> Optional[Tuple[int, int, int, int]]:
     """
-    Parse git diff output into structured FileChange objects.
+    Parse a hunk header of the form "@@ -old_start,old_count +new_start,new_count @@".
     
     Args:
-        diff_text: Raw git diff output
+        line: Raw hunk header line
         
     Returns:
-        List of FileChange objects representing the changes
+        Tuple of (old_start, old_count, new_start, new_count), or None if the
+        line is not a well-formed hunk header. Omitted counts default to 1.
     """
-    changes = []
-    current_change = None
-    current_hunk = None
+    # One C-level match beats splitting and partitioning the fields in Python
+    match = _HUNK_HEADER_RE.match(line)
+    if match is None:
+        return None
+    
+    old_start, old_count, new_start, new_count = match.groups()
+    return (
+        int(old_start),
+        int(old_count) if old_count else 1,
+        int(new_start),
+        int(new_count) if new_count else 1
+    )
+
+
+def _unquote_path(quoted: bytes) -> Optional[bytes]:
+    """
+    Undo git's C-style quoting of a path (the surrounding quotes already removed).
+    
+    Returns:
+        The raw path, or None if it holds a malformed octal escape
+    """
+    out = bytearray()
+    i = 0
+    n = len(quoted)
+    while i < n:
+        c = quoted[i]
+        if c == 92 and i + 1 < n:  # backslash
+            nxt = quoted[i + 1]
+            if 48 <= nxt <= 55:  # octal escape for a raw byte, e.g. \303
+                digits = quoted[i + 1:i + 4]
+                # Git always writes three octal digits
+                if len(digits) < 3 or not all(48 <= d <= 55 for d in digits):
+                    return None
+                out.append(int(digits, 8) & 0xFF)
+                i += 4
+                continue
+            out.append(_PATH_ESCAPES.get(nxt, nxt))
+            i += 2
+            continue
+        out.append(c)
+        i += 1
+    return bytes(out)
+
+
+def _split_quoted(header: bytes) -> Optional[Tuple[bytes, bytes]]:
+    """Split a header in which git quoted one or both paths."""
+    if header.startswith(b'"'):
+        # Find the closing quote of the first path, skipping escaped characters
+        i = 1
+        while i < len(header) and header[i] != 34:
+            i += 2 if header[i] == 92 else 1
+        old, rest = _unquote_path(header[1:i]), header[i + 1:]
+        if old is None or not rest.startswith(b' '):
+            return None
+        new = rest[1:]
+    else:
+        old, sep, new = header.rpartition(b' "')
+        if not sep:
+            return None
+        new = b'"' + new
     
-    lines = diff_text.split('\n')
+    if new.startswith(b'"') and new.endswith(b'"') and len(new) > 1:
+        new = _unquote_path(new[1:-1])
+        if new is None:
+            return None
+    return old, new
+
+
+def _split_file_header(header: bytes) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Split the "a/<old> b/<new>" part of a "diff --git" line into raw paths.
+    
+    Args:
+        header: Remainder of the "diff --git " line
+        
+    Returns:
+        Tuple of (old_path, new_path) without their a/ and b/ prefixes, or None
+    """
+    if header[:1] == b'"' or header[-1:] == b'"':
+        paths = _split_quoted(header)
+        if paths is None:
+            return None
+        old, new = paths
+    else:
+        # Unchanged paths (the common case) are split exactly down the middle,
+        # which stays correct even when the name itself contains " b/"
+        middle = (len(header) - 1) // 2
+        if (header[middle:middle + 3] == b' b/' and header[:2] == b'a/' and middle > 2
+                and header[2:middle] == header[middle + 3:]):
+            return header[2:middle], header[middle + 3:]
+        
+        # Renames: split on the last " b/", like a greedy "a/(.+) b/(.+)" match
+        old, sep, new = header.rpartition(b' b/')
+        if not sep:
+            return None
+        new = b'b/' + new
+    
+    if not old.startswith(b'a/') or not new.startswith(b'b/') or len(old) <= 2 or len(new) <= 2:
+        return None
+    return old[2:], new[2:]
+
+
+def _parse_file_section(header: bytes, lines: Iterable[bytes]) -> Optional[FileChange]:
+    """
+    Parse the changes to a single file.
+    
+    Args:
+        header: Remainder of the "diff --git " line, i.e. "a/<old> b/<new>"
+        lines: The section's remaining lines, without trailing newlines
+        
+    Returns:
+        FileChange for the section, or None if the header can't be parsed
+    """
+    paths = _split_file_header(header)
+    if paths is None:
+        return None
+    
+    change = FileChange(old_file=_decode(paths[0]), new_file=_decode(paths[1]))
+    current_hunk = None
+    added = removed = 0
     
     for line in lines:
-        if line.startswith('diff --git'):
-            # Start of a new file change
-            if current_change:
-                if current_hunk:
-                    current_change.hunks.append(current_hunk)
-                changes.append(current_change)
-            
-            current_change = None
-            current_hunk = None
-            
-            # Extract file names
-            match = re.match(r'diff --git a/(.+) b/(.+)', line)
-            if match:
-                old_file = match.group(1)
-                new_file = match.group(2)
-                current_change = FileChange(old_file=old_file, new_file=new_file)
+        c = line[:1]
         
-        elif line.startswith('---') or line.startswith('+++'):
-            # File path lines, can be ignored as we already have the paths
+        if current_hunk is not None and c in _CONTENT_PREFIXES:
+            # Content line (added, removed, or context) - by far the most common case
+            current_hunk.lines.append(_decode(line))
+            if c == b'+':
+                added += 1
+            elif c == b'-':
+                removed += 1
             continue
         
-        elif line.startswith('@@'):
+        if c == b'@' and line.startswith(b'@@'):
             # Start of a new hunk
-            if current_hunk and current_change:
-                current_change.hunks.append(current_hunk)
+            if current_hunk is not None:
+                current_hunk.added_count = added
+                current_hunk.removed_count = removed
+                change.hunks.append(current_hunk)
             
             current_hunk = None
+            added = removed = 0
             
-            # Parse hunk header: @@ -old_start,old_count +new_start,new_count @@
-            match = re.match(r'@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@', line)
-            if match:
-                old_start = int(match.group(1))
-                old_count = int(match.group(2)) if match.group(2) else 1
-                new_start = int(match.group(3))
-                new_count = int(match.group(4)) if match.group(4) else 1
-                
+            header = _parse_hunk_header(line)
+            if header is not None:
+                old_start, old_count, new_start, new_count = header
                 current_hunk = DiffHunk(
                     old_start=old_start,
                     old_count=old_count,
@@ -83,14 +208,124 @@ def parse_diff_output(diff_text: str) -> List[FileChange]:
                     new_count=new_count
                 )
         
+        elif line.startswith(b'---') or line.startswith(b'+++'):
+            # File path lines, can be ignored as we already have the paths
+            continue
+        
         elif current_hunk is not None:
-            # Content line (added, removed, or context)
-            current_hunk.lines.append(line)
+            # Other lines inside a hunk (e.g. "\ No newline at end of file")
+            current_hunk.lines.append(_decode(line))
+    
+    # Don't forget the last hunk
+    if current_hunk is not None:
+        current_hunk.added_count = added
+        current_hunk.removed_count = removed
+        change.hunks.append(current_hunk)
+    
+    return change
+
+
+def _split_section_lines(section: bytes, terminated: bool) -> List[bytes]:
+    """
+    Split a file section into lines the way parse_diff_stream reads them.
+    
+    Git ends lines with "\n" alone, so a "\r" before it is file content
+    (e.g. a CRLF file) and is kept.
+    
+    Args:
+        section: The section's bytes, starting at its header
+        terminated: Whether the section's final line ended with a newline
+        
+    Returns:
+        The lines without their newlines
+    """
+    lines = section.split(b'\n')
+    # After a final newline the split leaves an empty remainder, which isn't a line
+    if not terminated and len(lines) > 1 and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def parse_diff_output(diff_text: Union[str, bytes]) -> List[FileChange]:
+    """
+    Parse git diff output into structured FileChange objects.
+    
+    The diff is scanned as bytes; only file names and hunk content lines
+    are decoded to str. Passing bytes (e.g. from get_commit_diff with
+    as_bytes=True) skips decoding the structural header lines entirely.
+    
+    Args:
+        diff_text: Raw git diff output, as str or bytes
+        
+    Returns:
+        List of FileChange objects representing the changes
+    """
+    if isinstance(diff_text, str):
+        diff_text = diff_text.encode('utf-8', errors='surrogateescape')
+    
+    # Each "diff --git " starts a self-contained file section
+    sections = diff_text.split(b'\n' + _DIFF_GIT_PREFIX)
+    if sections[0].startswith(_DIFF_GIT_PREFIX):
+        sections[0] = sections[0][len(_DIFF_GIT_PREFIX):]
+    else:
+        # Anything before the first file header isn't part of any change
+        sections = sections[1:]
+    
+    changes = []
+    last = len(sections) - 1
+    for i, section in enumerate(sections):
+        # Split on "\n" only, like parse_diff_stream: splitlines() would also
+        # break content lines at a lone "\r". Sections before the last lost
+        # their final newline to the split above.
+        lines = _split_section_lines(section, terminated=i < last)
+        change = _parse_file_section(lines[0], lines[1:])
+        if change is not None:
+            changes.append(change)
+    
+    return changes
+
+
+def parse_diff_stream(lines: Iterable[Union[str, bytes]]) -> List[FileChange]:
+    """
+    Parse git diff output from an iterable of lines.
+    
+    Lines may be str or bytes and may keep their trailing newline, so a
+    git subprocess pipe or an open file can be passed directly without
+    reading the whole diff into memory first; only one file's lines are
+    held at a time.
+    
+    Args:
+        lines: Iterable of raw diff lines
+        
+    Returns:
+        List of FileChange objects representing the changes
+    """
+    changes = []
+    header = None
+    section_lines = []
+    
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode('utf-8', errors='surrogateescape')
+        if line[-1:] == b'\n':
+            # Only the newline; a "\r" before it is file content
+            line = line[:-1]
+        
+        if line[:1] == b'd' and line.startswith(_DIFF_GIT_PREFIX):
+            # Start of a new file change
+            if header is not None:
+                change = _parse_file_section(header, section_lines)
+                if change is not None:
+                    changes.append(change)
+            header = line[len(_DIFF_GIT_PREFIX):]
+            section_lines = []
+        elif header is not None:
+            section_lines.append(line)
     
-    # Don't forget the last change and hunk
-    if current_hunk and current_change:
-        current_change.hunks.append(current_hunk)
-    if current_change:
-        changes.append(current_change)
+    # Don't forget the last file
+    if header is not None:
+        change = _parse_file_section(header, section_lines)
+        if change is not None:
+            changes.append(change)
     
-    return changes
\ No newline at end of file
+    return changes
@@ -1,22 +1,39 @@
 """Enhanced diff parser that includes Python function information."""
 
+import asyncio
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Set
+from itertools import accumulate, repeat
+from typing import Iterable, List, Optional, Dict, Tuple, Union
 from pathlib import Path
 
-from diff_parser import FileChange, DiffHunk, parse_diff_output
-from python_function_detector import PythonFunction, PythonFunctionDetector
+from diff_parser import FileChange, DiffHunk, parse_diff_output, parse_diff_stream
+from python_function_detector import PythonFunction, PythonFunctionDetector, _copy_functions
 
 
-@dataclass
+# The name can be followed by a PEP 695 type-parameter list, as in "def first[T](items):"
+_DEF_RE = re.compile(r'\s*(async\s+)?def\s+([^\W\d]\w*)\s*(?:\[[^\]]*\])?\s*\(')
+
+# Shared FunctionChange.change_type values
+ADDED = sys.intern('added')
+MODIFIED = sys.intern('modified')
+DELETED = sys.intern('deleted')
+
+
+@dataclass(slots=True)
 class FunctionChange:
     """Represents a change within a specific Python function."""
     function: PythonFunction
-    change_type: str  # 'modified', 'added', 'deleted'
+    change_type: str  # MODIFIED, ADDED or DELETED
     affected_lines: List[int] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedFileChange:
     """Enhanced FileChange that includes function-level information for Python files."""
     original_change: FileChange
@@ -39,31 +56,113 @@ class EnhancedFileChange:
 class FunctionAwareDiffParser:
     """Parser that combines git diff information with Python function detection."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256, max_workers: Optional[int] = 1, parallel_threshold: int = 16):
         self.function_detector = PythonFunctionDetector()
+        
+        # LRU cache of (file content, detected functions) keyed by (path, mtime_ns, size),
+        # so analysing many commits doesn't re-read and re-parse unchanged files
+        self.cache_size = cache_size
+        self._detect_cache: OrderedDict[Tuple[str, int, int], Tuple[str, List[PythonFunction]]] = OrderedDict()
+        
+        # Diffs touching at least parallel_threshold Python files are enhanced in a
+        # process pool when max_workers is not 1 (None means one worker per CPU)
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
     
-    def parse_diff_with_functions(self, diff_text: str, repo_path: str) -> List[EnhancedFileChange]:
+    def parse_diff_with_functions(self, diff_text: Union[str, bytes, Iterable[Union[str, bytes]]],
+                                  repo_path: str,
+                                  file_contents: Optional[Dict[str, str]] = None) -> List[EnhancedFileChange]:
         """
         Parse git diff and enhance with function information for Python files.
         
         Args:
-            diff_text: Raw git diff output
+            diff_text: Raw git diff output, as str or bytes, or an iterable of
+                diff lines (e.g. from iter_commit_diff_lines)
             repo_path: Path to the git repository to read file contents
+            file_contents: Optional new contents of changed files, keyed by their
+                path in the diff. These are used instead of reading the working
+                tree, e.g. when it isn't checked out at the diffed commit
             
         Returns:
             List of EnhancedFileChange objects with function information
         """
         # First parse the diff normally
-        file_changes = parse_diff_output(diff_text)
+        file_changes = _parse_file_changes(diff_text)
+        
+        python_indices = [i for i, change in enumerate(file_changes) if change.new_file.endswith('.py')]
+        if self.max_workers != 1 and len(python_indices) >= self.parallel_threshold:
+            return self._enhance_in_pool(file_changes, python_indices, repo_path, file_contents)
+        
         enhanced_changes = []
         
         for change in file_changes:
-            enhanced_change = self._enhance_file_change(change, repo_path)
+            enhanced_change = self._enhance_file_change(change, repo_path, file_contents=file_contents)
             enhanced_changes.append(enhanced_change)
         
         return enhanced_changes
     
-    def _enhance_file_change(self, change: FileChange, repo_path: str) -> EnhancedFileChange:
+    def _enhance_in_pool(self, file_changes: List[FileChange], python_indices: List[int],
+                         repo_path: str, file_contents: Optional[Dict[str, str]] = None) -> List[EnhancedFileChange]:
+        """Enhance the Python file changes in worker processes, preserving diff order."""
+        enhanced_changes = [EnhancedFileChange(original_change=change) for change in file_changes]
+        python_changes = [file_changes[i] for i in python_indices]
+        # Each task only carries the contents of its own file, if any
+        contents = [file_contents.get(change.new_file) if file_contents else None for change in python_changes]
+        
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(python_changes) // (workers * 4))
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_enhance_in_worker, python_changes, repeat(repo_path), contents, chunksize=chunksize)
+            for i, enhanced in zip(python_indices, results):
+                enhanced_changes[i] = enhanced
+        
+        return enhanced_changes
+    
+    async def parse_diff_with_functions_async(self, diff_text: Union[str, bytes, Iterable[Union[str, bytes]]],
+                                              repo_path: str,
+                                              file_contents: Optional[Dict[str, str]] = None) -> List[EnhancedFileChange]:
+        """
+        Like parse_diff_with_functions, but read all changed Python files concurrently.
+        
+        The file reads are issued together on worker threads so their I/O
+        latency overlaps; function detection then runs on the event loop
+        thread as usual.
+        
+        Args:
+            diff_text: Raw git diff output, as str or bytes, or an iterable of diff lines
+            repo_path: Path to the git repository to read file contents
+            file_contents: Optional new contents of changed files, keyed by their
+                path in the diff, used instead of reading them
+            
+        Returns:
+            List of EnhancedFileChange objects with function information
+        """
+        file_changes = _parse_file_changes(diff_text)
+        
+        paths = list(dict.fromkeys(
+            Path(repo_path) / change.new_file
+            for change in file_changes
+            if change.new_file.endswith('.py') and not (file_contents and change.new_file in file_contents)
+        ))
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._load_file, path) for path in paths),
+            return_exceptions=True
+        )
+        # Files that failed to load fall back to the regular read path
+        prefetched = {
+            path: result for path, result in zip(paths, results)
+            if not isinstance(result, BaseException)
+        }
+        
+        return [
+            self._enhance_file_change(change, repo_path, prefetched.get(Path(repo_path) / change.new_file), file_contents)
+            for change in file_changes
+        ]
+    
+    def _enhance_file_change(self, change: FileChange, repo_path: str,
+                             loaded: Optional[Tuple[Tuple[str, int, int], Optional[str]]] = None,
+                             file_contents: Optional[Dict[str, str]] = None) -> EnhancedFileChange:
         """Enhance a single FileChange with function information."""
         enhanced = EnhancedFileChange(original_change=change)
         
@@ -72,33 +171,81 @@ class FunctionAwareDiffParser:
             return enhanced
         
         try:
-            # Read the current version of the file
-            file_path = Path(repo_path) / change.new_file
-            if file_path.exists():
-                file_content = file_path.read_text(encoding='utf-8')
-                enhanced.detected_functions = self.function_detector.detect_functions(file_content)
-                enhanced.function_changes = self._map_hunks_to_functions(change.hunks, enhanced.detected_functions, file_content)
+            file_content = file_contents.get(change.new_file) if file_contents else None
+            if file_content is not None:
+                # Given in memory; the detector caches its functions by content
+                # and returns copies of them
+                functions = self.function_detector.detect_functions(file_content)
+            else:
+                # Read the current version of the file. The parser's cache keeps
+                # its own functions, so the caller gets copies it may modify.
+                file_path = Path(repo_path) / change.new_file
+                file_content, cached = self._read_and_detect(file_path, loaded)
+                functions = _copy_functions(cached)
+            enhanced.detected_functions = functions
+            enhanced.function_changes = self._map_hunks_to_functions(change.hunks, enhanced.detected_functions, file_content)
         except Exception:
             # If we can't read the file or detect functions, just return the basic enhanced change
             pass
         
         return enhanced
     
+    def _load_file(self, file_path: Path) -> Tuple[Tuple[str, int, int], Optional[str]]:
+        """Stat and read a file through one descriptor, unless the cache already holds it (content is then None)."""
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            stat = os.fstat(fd)
+            key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+            if key in self._detect_cache:
+                return key, None
+            return key, _read_source(fd, stat.st_size)
+        finally:
+            os.close(fd)
+    
+    def _read_and_detect(self, file_path: Path,
+                         loaded: Optional[Tuple[Tuple[str, int, int], Optional[str]]] = None) -> Tuple[str, List[PythonFunction]]:
+        """Read a file and detect its functions, reusing results for unchanged files."""
+        key, file_content = loaded if loaded is not None else self._load_file(file_path)
+        
+        cached = self._detect_cache.get(key)
+        if cached is not None:
+            self._detect_cache.move_to_end(key)
+            return cached
+        
+        if file_content is None:
+            # Evicted between loading and detection
+            key, file_content = self._load_file(file_path)
+        result = (file_content, self.function_detector.detect_functions(file_content))
+        
+        if self.cache_size > 0:
+            self._detect_cache[key] = result
+            if len(self._detect_cache) > self.cache_size:
+                self._detect_cache.popitem(last=False)
+        
+        return result
+    
     def _map_hunks_to_functions(self, hunks: List[DiffHunk], functions: List[PythonFunction], file_content: str) -> List[FunctionChange]:
         """Map diff hunks to the functions they affect."""
         function_changes = []
         processed_functions = set()  # Track functions we've already processed
         
         # Get all changed lines from all hunks
-        all_added_lines = set()
-        all_removed_lines = set()
-        all_modified_lines = set()
+        all_added_lines = []
+        all_removed_lines = []
+        all_modified_lines = []
         
         for hunk in hunks:
             added_lines, removed_lines, modified_lines = self._extract_changed_lines_detailed(hunk)
-            all_added_lines.update(added_lines)
-            all_removed_lines.update(removed_lines)
-            all_modified_lines.update(modified_lines)
+            all_added_lines += added_lines
+            all_removed_lines += removed_lines
+            all_modified_lines += modified_lines
+        
+        # Sort the changed lines once so each function's share can be found
+        # by bisecting its bounds instead of intersecting per-function sets.
+        # Git emits hunks in file order, so this is normally already sorted.
+        added_sorted = sorted(all_added_lines)
+        removed_sorted = sorted(all_removed_lines)
+        modified_sorted = sorted(all_modified_lines)
         
         # Check each function against the changes
         for function in functions:
@@ -106,17 +253,13 @@ class FunctionAwareDiffParser:
             if function_key in processed_functions:
                 continue
             
-            # Check if this function overlaps with any changed lines
-            function_lines = set(range(function.start_line, function.end_line + 1))
+            # Find changed lines within the function's range
+            start, end = function.start_line, function.end_line
+            added_in_function = _lines_in_range(added_sorted, start, end)
+            removed_in_function = _lines_in_range(removed_sorted, start, end)
+            modified_in_function = _lines_in_range(modified_sorted, start, end)
             
-            # Find overlapping lines
-            added_in_function = function_lines.intersection(all_added_lines)
-            removed_in_function = function_lines.intersection(all_removed_lines)
-            modified_in_function = function_lines.intersection(all_modified_lines)
-            
-            all_affected_lines = added_in_function.union(removed_in_function).union(modified_in_function)
-            
-            if all_affected_lines:
+            if added_in_function or removed_in_function or modified_in_function:
                 # Determine the change type
                 change_type = self._determine_change_type_advanced(
                     function, 
@@ -126,10 +269,13 @@ class FunctionAwareDiffParser:
                     file_content
                 )
                 
+                all_affected_lines = set(added_in_function)
+                all_affected_lines.update(removed_in_function, modified_in_function)
+                
                 function_change = FunctionChange(
                     function=function,
                     change_type=change_type,
-                    affected_lines=sorted(list(all_affected_lines))
+                    affected_lines=sorted(all_affected_lines)
                 )
                 
                 function_changes.append(function_change)
@@ -137,14 +283,15 @@ class FunctionAwareDiffParser:
         
         # Also check for functions that might be entirely new (added in the diff)
         # This handles cases where new functions are added
+        coverage = _build_coverage_index(functions)
         for hunk in hunks:
-            new_functions = self._detect_new_functions_in_hunk(hunk, functions)
+            new_functions = self._detect_new_functions_in_hunk(hunk, functions, coverage)
             for new_func in new_functions:
                 function_key = (new_func.name, new_func.class_name, new_func.start_line)
                 if function_key not in processed_functions:
                     function_change = FunctionChange(
                         function=new_func,
-                        change_type="added",
+                        change_type=ADDED,
                         affected_lines=list(range(new_func.start_line, new_func.end_line + 1))
                     )
                     function_changes.append(function_change)
@@ -152,27 +299,34 @@ class FunctionAwareDiffParser:
         
         return function_changes
     
-    def _extract_changed_lines_detailed(self, hunk: DiffHunk) -> tuple[Set[int], Set[int], Set[int]]:
-        """Extract detailed information about added, removed, and context lines."""
-        added_lines = set()
-        removed_lines = set()  # These are the "old" line numbers that were removed
-        modified_lines = set()  # Context lines that might be affected
+    def _extract_changed_lines_detailed(self, hunk: DiffHunk) -> Tuple[List[int], List[int], List[int]]:
+        """Extract detailed information about added, removed, and context lines, in ascending order."""
+        added_lines = []
+        removed_lines = []  # These are the "old" line numbers that were removed
+        modified_lines = []  # Context lines that might be affected
         
         current_new_line = hunk.new_start
         current_old_line = hunk.old_start
         
+        # Bound methods and a single first-character compare keep the per-line work
+        # to a slice and one or two comparisons
+        append_added = added_lines.append
+        append_removed = removed_lines.append
+        append_modified = modified_lines.append
+        
         for line in hunk.lines:
-            if line.startswith('+'):
+            c = line[:1]
+            if c == '+':
                 # Added line
-                added_lines.add(current_new_line)
+                append_added(current_new_line)
                 current_new_line += 1
-            elif line.startswith('-'):
+            elif c == '-':
                 # Removed line (track old line numbers)
-                removed_lines.add(current_old_line)
+                append_removed(current_old_line)
                 current_old_line += 1
-            elif line.startswith(' '):
+            elif c == ' ':
                 # Context line - present in both versions
-                modified_lines.add(current_new_line)
+                append_modified(current_new_line)
                 current_new_line += 1
                 current_old_line += 1
             # Handle other line types gracefully
@@ -182,8 +336,8 @@ class FunctionAwareDiffParser:
         
         return added_lines, removed_lines, modified_lines
     
-    def _determine_change_type_advanced(self, function: PythonFunction, added_lines: Set[int], 
-                                      removed_lines: Set[int], modified_lines: Set[int], 
+    def _determine_change_type_advanced(self, function: PythonFunction, added_lines: List[int], 
+                                      removed_lines: List[int], modified_lines: List[int], 
                                       file_content: str) -> str:
         """Determine the type of change affecting a function with more sophisticated logic."""
         
@@ -192,98 +346,157 @@ class FunctionAwareDiffParser:
         
         # If the function declaration is in added lines, it's likely a new function
         if function_declaration_line in added_lines:
-            return 'added'
+            return ADDED
         
         # If there are removed lines but no added lines in the function, it might be deleted
         # However, we need to be careful because we're analyzing the "new" version of the file
         if removed_lines and not added_lines and not modified_lines:
-            return 'deleted'
+            return DELETED
         
         # If there are both additions and removals, or just additions, it's modified
         if added_lines or removed_lines:
-            return 'modified'
+            return MODIFIED
         
         # If only context lines are affected, it's still considered modified
         if modified_lines:
-            return 'modified'
+            return MODIFIED
         
         # Default to modified if we can't determine
-        return 'modified'
+        return MODIFIED
     
-    def _detect_new_functions_in_hunk(self, hunk: DiffHunk, existing_functions: List[PythonFunction]) -> List[PythonFunction]:
+    def _detect_new_functions_in_hunk(self, hunk: DiffHunk, existing_functions: List[PythonFunction],
+                                      coverage: Optional[Tuple[List[int], List[int]]] = None) -> List[PythonFunction]:
         """Detect completely new functions that are added in this hunk."""
-        new_functions = []
+        if coverage is None:
+            coverage = _build_coverage_index(existing_functions)
         
-        # Look for function definition lines in added content
-        added_content = []
+        new_functions = []
         current_line = hunk.new_start
         
+        # Look for function definition lines in added content
         for line in hunk.lines:
-            if line.startswith('+'):
-                line_content = line[1:]  # Remove the '+' prefix
-                added_content.append((current_line, line_content))
+            c = line[:1]
+            if c == '+':
+                # Match after the '+' prefix; the pattern checks the prefix and extracts the name
+                match = _DEF_RE.match(line, 1)
+                if match and ':' in line and not _is_covered(coverage, current_line):
+                    # Create a minimal function object for this new function
+                    # We can't determine the exact end line from just the hunk,
+                    # so we'll make a reasonable estimate
+                    estimated_end = current_line + 3  # Conservative estimate
+                    
+                    new_functions.append(PythonFunction(
+                        name=match.group(2),
+                        start_line=current_line,
+                        end_line=estimated_end,
+                        start_byte=0,
+                        end_byte=0,
+                        class_name=None,  # We'd need more context to determine this
+                        is_method=False,  # Same here
+                        is_async=match.group(1) is not None,
+                        decorator_names=[]
+                    ))
                 current_line += 1
-            elif line.startswith(' '):
+            elif c == ' ':
                 current_line += 1
             # Skip removed lines (they don't contribute to new line numbers)
         
-        # Check if any added lines contain function definitions
-        for line_num, content in added_content:
-            stripped = content.strip()
-            if (stripped.startswith('def ') or stripped.startswith('async def ')) and ':' in stripped:
-                # This looks like a function definition
-                # Check if this line is not already covered by existing functions
-                is_new = True
-                for existing_func in existing_functions:
-                    if existing_func.start_line <= line_num <= existing_func.end_line:
-                        is_new = False
-                        break
-                
-                if is_new:
-                    # Try to extract the function name
-                    try:
-                        if stripped.startswith('async def '):
-                            func_part = stripped[10:]  # Remove 'async def '
-                        else:
-                            func_part = stripped[4:]   # Remove 'def '
-                        
-                        func_name = func_part.split('(')[0].strip()
-                        
-                        # Create a minimal function object for this new function
-                        # We can't determine the exact end line from just the hunk,
-                        # so we'll make a reasonable estimate
-                        estimated_end = line_num + 3  # Conservative estimate
-                        
-                        new_func = PythonFunction(
-                            name=func_name,
-                            start_line=line_num,
-                            end_line=estimated_end,
-                            start_byte=0,
-                            end_byte=0,
-                            class_name=None,  # We'd need more context to determine this
-                            is_method=False,  # Same here
-                            is_async=stripped.startswith('async def '),
-                            decorator_names=[]
-                        )
-                        
-                        new_functions.append(new_func)
-                    except Exception:
-                        # If we can't parse the function name, skip it
-                        pass
-        
         return new_functions
 
 
-def parse_git_diff_with_functions(diff_text: str, repo_path: str) -> List[EnhancedFileChange]:
+_worker_parser: Optional[FunctionAwareDiffParser] = None
+
+# Parser behind parse_git_diff_with_functions, kept so repeated calls share its caches
+_default_parser: Optional[FunctionAwareDiffParser] = None
+
+
+def _enhance_in_worker(change: FileChange, repo_path: str, content: Optional[str] = None) -> EnhancedFileChange:
+    """Process-pool entry point; each worker lazily builds its own parser."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = FunctionAwareDiffParser()
+    file_contents = {change.new_file: content} if content is not None else None
+    return _worker_parser._enhance_file_change(change, repo_path, file_contents=file_contents)
+
+
+def _read_source(fd: int, size: int) -> str:
+    """Read a whole UTF-8 source file from an open descriptor, normalising newlines like read_text."""
+    # Asking for one byte more than the stat size detects growth without an extra read at EOF
+    data = os.read(fd, size + 1)
+    if len(data) != size:
+        chunks = [data]
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        data = b''.join(chunks)
+    
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _parse_file_changes(diff_text: Union[str, bytes, Iterable[Union[str, bytes]]]) -> List[FileChange]:
+    """Parse a diff given as text or as an iterable of lines."""
+    if isinstance(diff_text, (str, bytes)):
+        return parse_diff_output(diff_text)
+    return parse_diff_stream(diff_text)
+
+
+def _build_coverage_index(functions: List[PythonFunction]) -> Tuple[List[int], List[int]]:
+    """Return sorted start lines and the running maximum of end lines, for containment queries."""
+    ordered = sorted(functions, key=lambda f: f.start_line)
+    starts = [f.start_line for f in ordered]
+    max_ends = list(accumulate((f.end_line for f in ordered), max))
+    return starts, max_ends
+
+
+def _is_covered(coverage: Tuple[List[int], List[int]], line: int) -> bool:
+    """Check whether any indexed function spans the given line."""
+    starts, max_ends = coverage
+    i = bisect_right(starts, line) - 1
+    return i >= 0 and max_ends[i] >= line
+
+
+def _lines_in_range(sorted_lines: List[int], start: int, end: int) -> List[int]:
+    """Return the lines of a sorted list that fall within [start, end]."""
+    return sorted_lines[bisect_left(sorted_lines, start):bisect_right(sorted_lines, end)]
+
+
+def parse_git_diff_with_functions(diff_text: Union[str, bytes, Iterable[Union[str, bytes]]],
+                                  repo_path: str,
+                                  file_contents: Optional[Dict[str, str]] = None) -> List[EnhancedFileChange]:
     """
     Convenience function to parse git diff with function information.
     
+    All calls in the process go through one shared parser, so files that
+    are unchanged between calls (e.g. when walking a range of commits) are
+    only read and parsed once. Its caches hold up to 256 files and sources;
+    call reset_default_parser to drop them, or to swap in a parser with
+    other settings (e.g. cache_size=0 to turn caching off). Results are
+    copies, so callers can't affect each other through them.
+    
     Args:
-        diff_text: Raw git diff output
+        diff_text: Raw git diff output, as str or bytes, or an iterable of diff lines
         repo_path: Path to the git repository
+        file_contents: Optional new contents of changed files, keyed by their
+            path in the diff, used instead of reading the working tree
         
     Returns:
         List of EnhancedFileChange objects
     """
-    parser = FunctionAwareDiffParser()
-    return parser.parse_diff_with_functions(diff_text, repo_path)
\ No newline at end of file
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = FunctionAwareDiffParser()
+    return _default_parser.parse_diff_with_functions(diff_text, repo_path, file_contents)
+
+
+def reset_default_parser(parser: Optional[FunctionAwareDiffParser] = None) -> None:
+    """
+    Replace the parser shared by parse_git_diff_with_functions, dropping its caches.
+    
+    Args:
+        parser: Parser for later calls to use. If None, a new default
+            parser is created on the next call.
+    """
+    global _default_parser
+    _default_parser = parser
@@ -3,7 +3,7 @@
 import os
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Sequence, Tuple, Union
 from git import Repo
 
 
@@ -25,7 +25,23 @@ def clone_repository(repo_url: str, target_dir: Optional[str] = None) -> str:
     return target_dir
 
 
-def get_commit_diff(repo_path: str, commit_sha: str, parent_commit: Optional[str] = None) -> str:
+def _pathspec_args(paths: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """Arguments limiting a git diff to paths, or none to diff everything."""
+    return ('--', *paths) if paths else ()
+
+
+def _show_first_parent_args(commit_sha: str) -> Tuple[str, ...]:
+    """Arguments for git show to print just a commit's diff against its first parent.
+    
+    This is the same as "git diff commit^ commit", or every file added for an
+    initial commit, without first reading the commit to find its parent.
+    Peeling to ^{commit} keeps an annotated tag's message out of the output.
+    """
+    return ('--format=', '-m', '--first-parent', f'{commit_sha}^{{commit}}')
+
+
+def get_commit_diff(repo_path: str, commit_sha: str, parent_commit: Optional[str] = None,
+                    as_bytes: bool = False, paths: Optional[Sequence[str]] = None) -> Union[str, bytes]:
     """
     Get the git diff for a specific commit.
     
@@ -33,22 +49,57 @@ def get_commit_diff(repo_path: str, commit_sha: str, parent_commit: Optional[str
         repo_path: Path to the git repository
         commit_sha: SHA of the commit to get diff for
         parent_commit: SHA of parent commit. If None, uses commit^
+        as_bytes: If True, return the undecoded git output as bytes, which
+            parse_diff_output accepts directly
+        paths: Pathspecs to limit the diff to, e.g. ["*.py"], so git never
+            generates patch text for the other files
         
     Returns:
-        Raw git diff output as string
+        Raw git diff output as string (or bytes if as_bytes is True)
     """
     repo = Repo(repo_path)
+    stdout_as_string = not as_bytes
+    pathspec = _pathspec_args(paths)
     
     if parent_commit is None:
-        # Get diff against parent commit
-        commit = repo.commit(commit_sha)
-        if commit.parents:
-            parent = commit.parents[0]
-            diff = repo.git.diff(parent.hexsha, commit_sha)
-        else:
-            # Initial commit - show all files as added
-            diff = repo.git.show(commit_sha, format="")
+        diff = repo.git.show(*_show_first_parent_args(commit_sha), *pathspec, stdout_as_string=stdout_as_string)
     else:
-        diff = repo.git.diff(parent_commit, commit_sha)
+        diff = repo.git.diff(parent_commit, commit_sha, *pathspec, stdout_as_string=stdout_as_string)
+    
+    return diff
+
+
+def iter_commit_diff_lines(repo_path: str, commit_sha: str, parent_commit: Optional[str] = None,
+                           paths: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """
+    Stream the git diff for a specific commit line by line.
+    
+    The lines are read straight from the git subprocess pipe, so the diff
+    is never held in memory as a whole. Feed the result to
+    parse_diff_stream.
+    
+    Args:
+        repo_path: Path to the git repository
+        commit_sha: SHA of the commit to get diff for
+        parent_commit: SHA of parent commit. If None, uses commit^
+        paths: Pathspecs to limit the diff to, e.g. ["*.py"]
+        
+    Yields:
+        Raw diff lines as bytes, including their trailing newline
+    """
+    repo = Repo(repo_path)
+    pathspec = _pathspec_args(paths)
+    
+    if parent_commit is None:
+        process = repo.git.show(*_show_first_parent_args(commit_sha), *pathspec, as_process=True)
+    else:
+        process = repo.git.diff(parent_commit, commit_sha, *pathspec, as_process=True)
+    
+    try:
+        yield from process.stdout
+    except GeneratorExit:
+        # The consumer stopped early; don't leave git blocked on a full pipe
+        process.proc.kill()
+        raise
     
-    return diff
\ No newline at end of file
+    process.wait()
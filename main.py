@@ -1,4 +1,4 @@
-from git_operations import get_commit_diff
+from git_operations import iter_commit_diff_lines
 from function_aware_diff import parse_git_diff_with_functions
 
 
@@ -10,8 +10,8 @@ def main():
     repo_path = "sg-cdb"
     commit_sha = "979fec15253578653f5f8940a50cf7e01c77d933"
 
-    diff_text = get_commit_diff(repo_path, commit_sha)
-    enhanced_changes = parse_git_diff_with_functions(diff_text, repo_path)
+    diff_lines = iter_commit_diff_lines(repo_path, commit_sha)
+    enhanced_changes = parse_git_diff_with_functions(diff_lines, repo_path)
 
     for change in enhanced_changes:
         if change.is_python_file:
@@ -1,12 +1,37 @@
 """Python function detection using AST parsing (fallback from tree-sitter)."""
 
 import ast
-from dataclasses import dataclass
-from typing import List, Optional
+import asyncio
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 
 
-@dataclass
+# Decorator attributes of a property, e.g. @value.setter
+_PROPERTY_ACCESSORS = frozenset({"setter", "getter", "deleter"})
+
+# Node types whose statement lists can (transitively) hold a def, mapped to
+# the fields holding those lists (or handlers / match cases), classified once
+# from each type's _fields. Last field first, so that pushing them onto a
+# stack visits them in source order.
+_STATEMENT_FIELDS = {
+    node_type: tuple(reversed([
+        name for name in node_type._fields
+        if name in ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+    ]))
+    for node_type in (
+        ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef,
+        ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith,
+        ast.Try, ast.TryStar, ast.ExceptHandler, ast.Match, ast.match_case
+    )
+}
+
+
+@dataclass(slots=True)
 class PythonFunction:
     """Represents a Python function/method with its location."""
     name: str
@@ -17,18 +42,79 @@ class PythonFunction:
     class_name: Optional[str] = None
     is_method: bool = False
     is_async: bool = False
-    decorator_names: List[str] = None
+    decorator_names: List[str] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.decorator_names is None:
-            self.decorator_names = []
+
+def _copy_functions(functions: Iterable[PythonFunction]) -> List[PythonFunction]:
+    """Copy cached functions for a caller, so changes to the copies can't reach the cache."""
+    return [
+        PythonFunction(
+            f.name, f.start_line, f.end_line, f.start_byte, f.end_byte,
+            f.class_name, f.is_method, f.is_async, list(f.decorator_names)
+        )
+        for f in functions
+    ]
+
+
+class _FunctionIndex:
+    """Detected functions of one source, with a lazily built line lookup."""
+    
+    __slots__ = ('functions', '_starts', '_ends', '_parents')
+    
+    def __init__(self, functions: List[PythonFunction]):
+        self.functions = functions  # Sorted by start line
+        self._starts = None
+    
+    def _build(self):
+        """Record each function's start and end, and its innermost enclosing function."""
+        starts = [f.start_line for f in self.functions]
+        ends = [f.end_line for f in self.functions]
+        parents = []
+        open_functions = []
+        for i, start in enumerate(starts):
+            while open_functions and ends[open_functions[-1]] < start:
+                open_functions.pop()
+            parents.append(open_functions[-1] if open_functions else -1)
+            open_functions.append(i)
+        self._starts, self._ends, self._parents = starts, ends, parents
+    
+    def functions_at_lines(self, line_numbers: Iterable[int]) -> List[PythonFunction]:
+        """Return the functions containing any of the lines, ordered by start line."""
+        if self._starts is None:
+            self._build()
+        starts, ends, parents = self._starts, self._ends, self._parents
+        
+        hits = set()
+        for line in set(line_numbers):
+            # Functions nest, so the ones containing the line are the last one
+            # starting at or before it, or that one's closest enclosing function
+            # that is still open, plus everything enclosing that
+            i = bisect_right(starts, line) - 1
+            while i >= 0 and ends[i] < line:
+                i = parents[i]
+            while i >= 0 and i not in hits:
+                hits.add(i)
+                i = parents[i]
+        
+        functions = self.functions
+        return [functions[i] for i in sorted(hits)]
 
 
 class PythonFunctionDetector:
     """Detects Python functions and their line ranges using Python's AST."""
     
-    def __init__(self):
-        pass
+    def __init__(self, cache_size: int = 256):
+        # LRU cache of detected functions keyed by the source itself, so the
+        # same content (e.g. detect_functions then find_functions_at_lines) is
+        # only parsed once. The str hash is cached on the object and a hit costs
+        # one comparison, with no encoded copy of the source to hash.
+        # Callers get copies of the cached functions, so they may modify them.
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, _FunctionIndex] = OrderedDict()
+        
+        # Lines of the most recently split source, for the end-line fallback
+        self._split_source: Optional[str] = None
+        self._split_lines: List[str] = []
     
     def detect_functions(self, file_content: str) -> List[PythonFunction]:
         """
@@ -40,46 +126,75 @@ class PythonFunctionDetector:
         Returns:
             List of PythonFunction objects with their line ranges
         """
-        try:
-            tree = ast.parse(file_content)
-        except SyntaxError:
-            return []
+        return _copy_functions(self._get_index(file_content).functions)
+    
+    def _get_index(self, file_content: str) -> _FunctionIndex:
+        """Detect the functions in file_content, or return the cached result."""
+        cached = self._cache.get(file_content)
+        if cached is not None:
+            self._cache.move_to_end(file_content)
+            return cached
         
         functions = []
-        self._traverse_node(tree, file_content, functions, class_name=None, inside_function=False)
+        
+        # Source without the "def" keyword can't define a function, so don't parse it
+        if 'def' in file_content:
+            try:
+                tree = ast.parse(file_content)
+            except SyntaxError:
+                pass
+            else:
+                functions = self._functions_from_tree(tree, file_content)
+        
+        index = _FunctionIndex(functions)
+        if self.cache_size > 0:
+            self._cache[file_content] = index
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return index
+    
+    def _functions_from_tree(self, tree: ast.AST, source: str) -> List[PythonFunction]:
+        """Collect the function definitions in tree, sorted by start line."""
+        functions = []
+        self._traverse_node(tree, source, functions)
         
         # Sort functions by start line for consistency
         functions.sort(key=lambda f: f.start_line)
         return functions
     
-    def _traverse_node(self, node: ast.AST, source: str, functions: List[PythonFunction], 
-                      class_name: str = None, inside_function: bool = False):
-        """Recursively traverse AST nodes to find function definitions."""
+    def _traverse_node(self, tree: ast.AST, source: str, functions: List[PythonFunction]):
+        """Walk the statement tree iteratively to find function definitions."""
+        # Stack of (node, enclosing class name); only statement lists are
+        # descended into, since expressions can't contain a def
+        stack = [(tree, None)]
+        pop = stack.pop
+        push = stack.extend
         
-        if isinstance(node, ast.ClassDef):
-            # Process class and its methods
-            current_class_name = node.name
+        while stack:
+            node, class_name = pop()
+            node_type = type(node)
+            
+            if node_type is ast.ClassDef:
+                # Methods of a class nested anywhere still belong to that class
+                class_name = node.name
+            elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+                function = self._extract_function_info(node, source, class_name)
+                if function:
+                    functions.append(function)
+                
+                # For nested functions: they should NOT inherit the class_name
+                # Only direct class members should be considered methods
+                class_name = None
             
-            # If we're inside a function, this is a nested class
-            # Nested classes still count as being "in" that class for their methods
-            for child in ast.iter_child_nodes(node):
-                self._traverse_node(child, source, functions, current_class_name, inside_function)
-        
-        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Extract function information
-            function = self._extract_function_info(node, source, class_name)
-            if function:
-                functions.append(function)
+            field_names = _STATEMENT_FIELDS.get(node_type)
+            if field_names is None:
+                continue
             
-            # For nested functions: they should NOT inherit the class_name
-            # Only direct class members should be considered methods
-            for child in ast.iter_child_nodes(node):
-                self._traverse_node(child, source, functions, class_name=None, inside_function=True)
-        
-        else:
-            # Continue traversing child nodes
-            for child in ast.iter_child_nodes(node):
-                self._traverse_node(child, source, functions, class_name, inside_function)
+            # Push children in reverse so they're visited in source order
+            for field_name in field_names:
+                children = getattr(node, field_name)
+                if children:
+                    push([(child, class_name) for child in reversed(children)])
     
     def _extract_function_info(self, node: ast.FunctionDef, source: str, class_name: str = None) -> Optional[PythonFunction]:
         """Extract function information from a function definition node."""
@@ -99,16 +214,18 @@ class PythonFunctionDetector:
         # Check if this is a method (inside a class)
         is_method = class_name is not None
         
+        # Positional arguments, in field order: keyword binding for nine fields
+        # costs about as much as the rest of the constructor
         return PythonFunction(
-            name=function_name,
-            start_line=start_line,
-            end_line=end_line,
-            start_byte=0,  # AST doesn't provide byte offsets easily
-            end_byte=0,    # AST doesn't provide byte offsets easily
-            class_name=class_name,
-            is_method=is_method,
-            is_async=is_async,
-            decorator_names=decorators
+            function_name,
+            start_line,
+            end_line,
+            0,  # start_byte - AST doesn't provide byte offsets easily
+            0,  # end_byte - AST doesn't provide byte offsets easily
+            class_name,
+            is_method,
+            is_async,
+            decorators
         )
     
     def _calculate_end_line(self, node: ast.FunctionDef, source: str) -> int:
@@ -135,7 +252,7 @@ class PythonFunctionDetector:
                     end_line += 1
                 elif isinstance(last_stmt, ast.Return) and last_stmt.value:
                     # Return statements might be multiline
-                    source_lines = source.split('\n')
+                    source_lines = self._source_lines(source)
                     if end_line <= len(source_lines):
                         # Check if the return statement continues on next lines
                         for i in range(end_line, min(end_line + 3, len(source_lines))):
@@ -149,33 +266,28 @@ class PythonFunctionDetector:
         # Ultimate fallback: return start line
         return node.lineno
     
+    def _source_lines(self, source: str) -> List[str]:
+        """Split source into lines, at most once per source."""
+        if self._split_source is not source:
+            self._split_lines = source.split('\n')
+            self._split_source = source
+        return self._split_lines
+    
     def _extract_decorator_name(self, decorator) -> Optional[str]:
         """Extract decorator name from decorator node with special property handling."""
-        if isinstance(decorator, ast.Name):
+        node_type = type(decorator)
+        if node_type is ast.Call:
+            # Handle decorator calls like @decorator()
+            decorator = decorator.func
+            node_type = type(decorator)
+        
+        if node_type is ast.Name:
             return decorator.id
-        elif isinstance(decorator, ast.Attribute):
-            # Handle cases like @current_value.setter
+        if node_type is ast.Attribute:
+            # Handle cases like @current_value.setter - property accessors
+            # all count as a "property" decorator
             attr_name = decorator.attr
-            if attr_name == "setter":
-                # This is a property setter - count it as a "property" decorator
-                return "property"
-            elif attr_name == "getter":
-                # This is a property getter - count it as a "property" decorator  
-                return "property"
-            elif attr_name == "deleter":
-                # This is a property deleter - count it as a "property" decorator
-                return "property"
-            else:
-                return attr_name
-        elif isinstance(decorator, ast.Call):
-            # Handle decorator calls like @decorator()
-            if isinstance(decorator.func, ast.Name):
-                return decorator.func.id
-            elif isinstance(decorator.func, ast.Attribute):
-                attr_name = decorator.func.attr
-                if attr_name in ("setter", "getter", "deleter"):
-                    return "property"
-                return attr_name
+            return "property" if attr_name in _PROPERTY_ACCESSORS else attr_name
         return None
     
     def find_functions_at_lines(self, file_content: str, line_numbers: List[int]) -> List[PythonFunction]:
@@ -189,23 +301,51 @@ class PythonFunctionDetector:
         Returns:
             List of PythonFunction objects that contain any of the given lines
         """
-        functions = self.detect_functions(file_content)
-        containing_functions = []
-        
-        for function in functions:
-            for line_num in line_numbers:
-                if function.start_line <= line_num <= function.end_line:
-                    if function not in containing_functions:
-                        containing_functions.append(function)
-                    break
-        
-        return containing_functions
+        # No lines can't hit a function, so don't parse (or cache) the source
+        if not line_numbers:
+            return []
+        return _copy_functions(self._get_index(file_content).functions_at_lines(line_numbers))
+
+
+_FILE_CACHE_SIZE = 256
+
+# Functions per (path, mtime_ns, size), so unchanged files aren't even re-read
+_file_cache: OrderedDict[Tuple[str, int, int], List[PythonFunction]] = OrderedDict()
+_file_detector = PythonFunctionDetector(cache_size=0)
+
+
+def _read_python_file(file_path: str) -> Tuple[Tuple[str, int, int], Optional[str], Optional[List[PythonFunction]]]:
+    """Stat a Python file and return its cache key with either its cached functions or its content."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        st = os.fstat(f.fileno())
+        key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        cached = _file_cache.get(key)
+        if cached is not None:
+            return key, None, cached
+        return key, f.read(), None
+
+
+def _detect_in_read_file(key: Tuple[str, int, int], content: Optional[str],
+                         cached: Optional[List[PythonFunction]]) -> List[PythonFunction]:
+    """Detect (or reuse) the functions of a file read by _read_python_file."""
+    if cached is not None:
+        if key in _file_cache:
+            _file_cache.move_to_end(key)
+        return _copy_functions(cached)
+    
+    functions = _file_detector.detect_functions(content)
+    _file_cache[key] = functions
+    if len(_file_cache) > _FILE_CACHE_SIZE:
+        _file_cache.popitem(last=False)
+    return _copy_functions(functions)
 
 
 def detect_python_functions_in_file(file_path: str) -> List[PythonFunction]:
     """
     Convenience function to detect Python functions in a file.
     
+    Results are cached per file path, modification time and size.
+    
     Args:
         file_path: Path to the Python file
         
@@ -216,10 +356,64 @@ def detect_python_functions_in_file(file_path: str) -> List[PythonFunction]:
         return []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        detector = PythonFunctionDetector()
-        return detector.detect_functions(content)
+        return _detect_in_read_file(*_read_python_file(file_path))
     except Exception:
-        return []
\ No newline at end of file
+        return []
+
+
+def detect_python_functions_in_files(file_paths: Iterable[str],
+                                     max_workers: Optional[int] = 1) -> Dict[str, List[PythonFunction]]:
+    """
+    Detect Python functions in many files, optionally parsing them in a process pool.
+    
+    The pool is opt-in: starting worker processes costs more than parsing
+    a handful of files, and on platforms that spawn workers the calling
+    script must guard its entry point with if __name__ == "__main__".
+    
+    Args:
+        file_paths: Paths to the Python files
+        max_workers: Number of worker processes (1, the default, parses
+            serially in this process; None means one per CPU)
+        
+    Returns:
+        Dict mapping each path to its detected Python functions
+    """
+    paths = list(dict.fromkeys(file_paths))
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) < 2:
+        return {path: detect_python_functions_in_file(path) for path in paths}
+    
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        return dict(zip(paths, executor.map(detect_python_functions_in_file, paths, chunksize=chunksize)))
+
+
+async def detect_python_functions_in_files_async(file_paths: Iterable[str]) -> Dict[str, List[PythonFunction]]:
+    """
+    Detect Python functions in many files, reading them concurrently.
+    
+    The file reads are issued together on worker threads so their I/O
+    latency overlaps; parsing then runs on the event loop thread.
+    
+    Args:
+        file_paths: Paths to the Python files
+        
+    Returns:
+        Dict mapping each path to its detected Python functions
+    """
+    paths = list(dict.fromkeys(file_paths))
+    python_paths = [path for path in paths if path.endswith('.py')]
+    reads = await asyncio.gather(
+        *(asyncio.to_thread(_read_python_file, path) for path in python_paths),
+        return_exceptions=True
+    )
+    
+    results = {path: [] for path in paths}
+    for path, read in zip(python_paths, reads):
+        if isinstance(read, Exception):
+            continue
+        try:
+            results[path] = _detect_in_read_file(*read)
+        except Exception:
+            pass
+    return results
@@ -5,11 +5,30 @@ import subprocess
 import sys
 import os
 import time
-import gc
+import functools
+import importlib.util
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 
+PROJECT_ROOT = Path(__file__).parent.absolute()
+
+# Environment for pytest subprocesses, built once
+CHILD_ENV = {**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)}
+
+# Lines of each pytest stream kept for the failure report
+OUTPUT_KEEP_LINES = 200
+
+TEST_FILES = [
+    'tests/test_diff_parser.py',
+    'tests/test_git_operations.py',
+    'tests/test_python_function_detection.py'
+]
+
+
 def print_header(title):
     """Print a formatted header."""
     print("\n" + "=" * 80)
@@ -24,6 +43,31 @@ def print_section(title):
     print("─" * 60)
 
 
+@functools.lru_cache(maxsize=None)
+def has_module(name):
+    """Check whether a module can be imported, without running its top-level code."""
+    return importlib.util.find_spec(name) is not None
+
+
+def parallel_args(concurrent_files=1):
+    """pytest-xdist arguments to spread a test file over several workers, if xdist is installed.
+    
+    The cores are shared between the test files that run at the same time.
+    """
+    if not has_module('xdist'):
+        return []
+    
+    # Leave a couple of cores free on Windows, where workers are slower to start
+    cpus = (os.cpu_count() or 1) - (2 if os.name == 'nt' else 0)
+    workers = cpus // concurrent_files
+    if workers < 2:
+        return []
+    
+    # Each invocation runs a single file, so its tests are load-balanced
+    # (--dist=loadfile would put them all on one worker)
+    return ['-n', str(workers)]
+
+
 def check_dependencies():
     """Check if all required dependencies are available."""
     print_section("🔍 Checking Dependencies")
@@ -35,10 +79,9 @@ def check_dependencies():
     
     missing = []
     for module, package in required_modules:
-        try:
-            __import__(module)
+        if has_module(module):
             print(f"   ✅ {package} - OK")
-        except ImportError:
+        else:
             print(f"   ❌ {package} - MISSING")
             missing.append(package)
     
@@ -46,18 +89,31 @@ def check_dependencies():
         print(f"\n❌ Missing dependencies: {', '.join(missing)}")
         return False
     
+    if not has_module('xdist'):
+        print("   ⚠️  pytest-xdist - not installed, test files will run on a single worker")
+    
     print("\n✅ All dependencies found!")
     return True
 
 
-def run_individual_test(test_file, project_root):
-    """Run a single test file with better error handling."""
-    print(f"\n🔄 Running {test_file}...")
-    print("─" * 40)
+def drain_lines(pipe, keep):
+    """Read a text pipe to EOF, passing each line (without its newline) to keep."""
+    with pipe:
+        for line in pipe:
+            keep(line.rstrip('\n'))
+
+
+def run_individual_test(test_file, project_root, parallel=True, concurrent_files=1, log=print):
+    """Run a single test file with better error handling.
+    
+    Output goes through log, so concurrent runs can buffer it and print
+    each file's report in one piece.
+    """
+    log(f"\n🔄 Running {test_file}...")
+    log("─" * 40)
     
     # Setup environment
-    env = os.environ.copy()
-    env['PYTHONPATH'] = str(project_root)
+    env = CHILD_ENV if project_root == PROJECT_ROOT else {**os.environ, 'PYTHONPATH': str(project_root)}
     
     cmd = [
         sys.executable, '-m', 'pytest',
@@ -66,87 +122,164 @@ def run_individual_test(test_file, project_root):
         '-x',  # Stop on first failure for easier debugging
         '--disable-warnings'  # Reduce noise
     ]
+    if parallel:
+        cmd.extend(parallel_args(concurrent_files))
+    
+    # Only the end of stdout and the start of stderr are ever shown, so keep
+    # just those instead of buffering everything pytest prints
+    stdout_tail = deque(maxlen=OUTPUT_KEEP_LINES)
+    stderr_head = []
+    
+    def keep_stderr(line):
+        if len(stderr_head) < OUTPUT_KEEP_LINES:
+            stderr_head.append(line)
     
     start_time = time.time()
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             cmd, 
             env=env, 
             cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=120  # Longer timeout for Windows
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
         )
+        # Drain both pipes on threads (select() doesn't support pipes on Windows)
+        readers = [
+            threading.Thread(target=drain_lines, args=(process.stdout, stdout_tail.append), daemon=True),
+            threading.Thread(target=drain_lines, args=(process.stderr, keep_stderr), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            returncode = process.wait(timeout=120)  # Longer timeout for Windows
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            for reader in readers:
+                reader.join()
         
         duration = time.time() - start_time
+        stdout = '\n'.join(stdout_tail)
+        stderr = '\n'.join(stderr_head)
         
-        if result.returncode == 0:
-            print(f"   ✅ {test_file} - PASSED ({duration:.2f}s)")
+        if returncode == 0:
+            log(f"   ✅ {test_file} - PASSED ({duration:.2f}s)")
             return True
         else:
-            print(f"   ❌ {test_file} - FAILED ({duration:.2f}s)")
+            log(f"   ❌ {test_file} - FAILED ({duration:.2f}s)")
             
             # Show relevant output
-            if result.stdout:
-                print("   📝 Output:")
-                lines = result.stdout.strip().split('\n')
+            if stdout:
+                log("   📝 Output:")
+                lines = stdout.strip().split('\n')
                 for line in lines[-15:]:  # Show last 15 lines
                     if line.strip() and not line.startswith('='):
-                        print(f"      {line}")
+                        log(f"      {line}")
             
-            if result.stderr:
-                print("   🔥 Errors:")
-                lines = result.stderr.strip().split('\n')
+            if stderr:
+                log("   🔥 Errors:")
+                lines = stderr.strip().split('\n')
                 for line in lines[:10]:  # Show first 10 error lines
                     if line.strip():
-                        print(f"      {line}")
+                        log(f"      {line}")
             
             return False
                     
     except subprocess.TimeoutExpired:
-        print(f"   ⏰ {test_file} - TIMEOUT (120s)")
+        log(f"   ⏰ {test_file} - TIMEOUT (120s)")
         return False
     except Exception as e:
-        print(f"   💥 {test_file} - ERROR: {e}")
+        log(f"   💥 {test_file} - ERROR: {e}")
         return False
 
 
-def run_tests_individually():
+def run_tests_individually(parallel=True):
     """Run tests one by one for better debugging."""
     print_section("🧪 Running Tests Individually")
     
-    project_root = Path(__file__).parent.absolute()
-    
-    test_files = [
-        'tests/test_git_operations.py',
-        'tests/test_python_function_detection.py'
-    ]
+    project_root = PROJECT_ROOT
+    test_files = TEST_FILES
     
     results = []
     
-    for test_file in test_files:
-        # Force garbage collection between tests to help with cleanup
-        gc.collect()
+    if parallel and len(test_files) > 1:
+        # The files are independent, so run them all at once and print each
+        # file's buffered report as it is collected, in order
+        with ThreadPoolExecutor(max_workers=len(test_files)) as executor:
+            futures = []
+            for test_file in test_files:
+                report = []
+                future = executor.submit(
+                    run_individual_test, test_file, project_root, parallel, len(test_files), report.append
+                )
+                futures.append((test_file, future, report))
+            
+            for test_file, future, report in futures:
+                success = future.result()
+                for line in report:
+                    print(line)
+                results.append((test_file, success))
         
-        success = run_individual_test(test_file, project_root)
+        return results
+    
+    for test_file in test_files:
+        success = run_individual_test(test_file, project_root, parallel)
         results.append((test_file, success))
-        
-        # Small delay to help with file cleanup on Windows
-        time.sleep(0.5)
     
     return results
 
 
+class _FileResultCollector:
+    """pytest plugin recording which test files ran and which had failures."""
+    
+    def __init__(self):
+        self.ran = set()
+        self.failed = set()
+    
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.failed.add(report.nodeid.split('::', 1)[0])
+    
+    def pytest_runtest_logreport(self, report):
+        test_file = report.nodeid.split('::', 1)[0]
+        self.ran.add(test_file)
+        if report.failed:
+            self.failed.add(test_file)
+
+
+def run_tests_in_process(parallel=True):
+    """Run all test files in one pytest session inside this process.
+    
+    This skips the interpreter start-up, plugin loading and collection that
+    every per-file subprocess pays for, at the cost of isolation between
+    the files.
+    """
+    print_section("🧪 Running Tests In-Process")
+    
+    import pytest
+    
+    args = [*TEST_FILES, '-v', '--tb=short', '--no-header', '--disable-warnings']
+    if parallel:
+        args.extend(parallel_args())
+    
+    collector = _FileResultCollector()
+    start_time = time.time()
+    pytest.main(args, plugins=[collector])
+    duration = time.time() - start_time
+    print(f"\n⏱️  Finished in {duration:.2f}s")
+    
+    return [
+        (test_file, test_file in collector.ran and test_file not in collector.failed)
+        for test_file in TEST_FILES
+    ]
+
+
 def run_specific_test_method(test_method):
     """Run a specific test method."""
     print_section(f"🎯 Running Specific Test: {test_method}")
     
-    project_root = Path(__file__).parent.absolute()
-    
-    # Setup environment
-    env = os.environ.copy()
-    env['PYTHONPATH'] = str(project_root)
-    
     cmd = [
         sys.executable, '-m', 'pytest',
         test_method,
@@ -155,7 +288,7 @@ def run_specific_test_method(test_method):
     ]
     
     try:
-        result = subprocess.run(cmd, env=env, cwd=project_root, text=True)
+        result = subprocess.run(cmd, env=CHILD_ENV, cwd=PROJECT_ROOT, text=True)
         return result.returncode == 0
     except Exception as e:
         print(f"Error running specific test: {e}")
@@ -168,8 +301,14 @@ def main():
     print(f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Change to project directory
-    project_root = Path(__file__).parent.absolute()
-    os.chdir(project_root)
+    os.chdir(PROJECT_ROOT)
+    
+    # --no-parallel runs the test files one after another, each in a single
+    # pytest process, for debugging
+    parallel = '--no-parallel' not in sys.argv[1:]
+    
+    # --in-process runs all the files in one pytest session in this process
+    in_process = '--in-process' in sys.argv[1:]
     
     try:
         # Step 1: Check dependencies
@@ -178,7 +317,10 @@ def main():
             sys.exit(1)
         
         # Step 2: Run individual tests
-        results = run_tests_individually()
+        if in_process:
+            results = run_tests_in_process(parallel)
+        else:
+            results = run_tests_individually(parallel)
         
         # Step 3: Print summary
         print_section("📊 TEST SUMMARY")
@@ -3,19 +3,20 @@
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_python_version():
+def check_python_version(log=print):
     """Check Python version."""
-    print(f"🐍 Python version: {sys.version}")
+    log(f"🐍 Python version: {sys.version}")
     if sys.version_info < (3, 8):
-        print("⚠️  Warning: Python 3.8+ recommended")
+        log("⚠️  Warning: Python 3.8+ recommended")
     else:
-        print("✅ Python version is good")
+        log("✅ Python version is good")
 
-def check_imports():
+def check_imports(log=print):
     """Test importing each module individually."""
-    print("\n🔍 Testing module imports...")
+    log("\n🔍 Testing module imports...")
     
     modules_to_test = [
         'git_operations',
@@ -27,15 +28,15 @@ def check_imports():
     for module in modules_to_test:
         try:
             __import__(module)
-            print(f"  ✅ {module} - imported successfully")
+            log(f"  ✅ {module} - imported successfully")
         except ImportError as e:
-            print(f"  ❌ {module} - import failed: {e}")
+            log(f"  ❌ {module} - import failed: {e}")
         except Exception as e:
-            print(f"  ⚠️  {module} - other error: {e}")
+            log(f"  ⚠️  {module} - other error: {e}")
 
-def test_python_ast():
+def test_python_ast(log=print):
     """Test Python AST functionality."""
-    print("\n🌳 Testing Python AST parsing...")
+    log("\n🌳 Testing Python AST parsing...")
     
     try:
         import ast
@@ -52,33 +53,33 @@ class TestClass:
         tree = ast.parse(test_code)
         
         if tree:
-            print("  ✅ Python AST parsing works")
+            log("  ✅ Python AST parsing works")
         else:
-            print("  ❌ Python AST parsing failed")
+            log("  ❌ Python AST parsing failed")
             
     except Exception as e:
-        print(f"  ❌ Python AST error: {e}")
+        log(f"  ❌ Python AST error: {e}")
 
-def test_git_functionality():
+def test_git_functionality(log=print):
     """Test GitPython functionality."""
-    print("\n🔧 Testing GitPython...")
+    log("\n🔧 Testing GitPython...")
     
     try:
         from git import Repo
-        print("  ✅ GitPython imported successfully")
+        log("  ✅ GitPython imported successfully")
         
         # Test if we can create a temporary repo
         import tempfile
         with tempfile.TemporaryDirectory() as temp_dir:
             repo = Repo.init(temp_dir)
-            print("  ✅ Can create Git repositories")
+            log("  ✅ Can create Git repositories")
             
     except Exception as e:
-        print(f"  ❌ GitPython error: {e}")
+        log(f"  ❌ GitPython error: {e}")
 
-def test_simple_functionality():
+def test_simple_functionality(log=print):
     """Test basic functionality of our modules."""
-    print("\n🧪 Testing basic functionality...")
+    log("\n🧪 Testing basic functionality...")
     
     try:
         from python_function_detector import PythonFunctionDetector
@@ -99,17 +100,17 @@ async def async_function():
         
         functions = detector.detect_functions(test_python)
         if functions and len(functions) > 0:
-            print(f"  ✅ Python function detection works - found {len(functions)} function(s)")
+            log(f"  ✅ Python function detection works - found {len(functions)} function(s)")
             for func in functions:
                 decorators = f" @{', @'.join(func.decorator_names)}" if func.decorator_names else ""
                 async_marker = " (async)" if func.is_async else ""
                 class_info = f" in {func.class_name}" if func.class_name else ""
-                print(f"    - {func.name}{decorators}{async_marker} (lines {func.start_line}-{func.end_line}){class_info}")
+                log(f"    - {func.name}{decorators}{async_marker} (lines {func.start_line}-{func.end_line}){class_info}")
         else:
-            print("  ❌ Python function detection failed - no functions found")
+            log("  ❌ Python function detection failed - no functions found")
             
     except Exception as e:
-        print(f"  ❌ Functionality test error: {e}")
+        log(f"  ❌ Functionality test error: {e}")
 
 def main():
     """Run all diagnostic checks."""
@@ -124,11 +125,25 @@ def main():
     print(f"📁 Project directory: {project_root}")
     print(f"🔧 Working directory: {os.getcwd()}")
     
-    check_python_version()
-    check_imports()
-    test_python_ast()
-    test_git_functionality()
-    test_simple_functionality()
+    # The checks are independent, so run them concurrently and print each
+    # one's buffered output in order
+    checks = [
+        check_python_version,
+        check_imports,
+        test_python_ast,
+        test_git_functionality,
+        test_simple_functionality
+    ]
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        reports = []
+        for check in checks:
+            report = []
+            reports.append((executor.submit(check, report.append), report))
+        
+        for future, report in reports:
+            future.result()
+            for line in report:
+                print(line)
     
     print("\n" + "=" * 50)
     print("✅ Diagnostics complete!")
@@ -0,0 +1,355 @@
+"""Shared fixtures and hooks for the test suite.
+
+GitPython is imported inside the helpers that use it, so runs that only
+select the git-free tests (e.g. tests/test_diff_parser.py) never load it.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cached", action="store_true",
+        help="skip tests that already passed against the current source files"
+    )
+
+
+def pytest_configure(config):
+    """Keep temporary repositories on tmpfs when one is available (Linux).
+    
+    tmp_path and tempfile.mkdtemp both end up under TMPDIR, so the git-heavy
+    tests stop waiting on disk writes. An explicit TMPDIR is left alone.
+    """
+    if 'TMPDIR' not in os.environ and os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        os.environ['TMPDIR'] = '/dev/shm'
+        # gettempdir() caches its first answer, which may predate TMPDIR
+        tempfile.tempdir = None
+    
+    # Verbose results gathered from pytest-xdist workers, keyed by test module
+    config._worker_results = {}
+    
+    # --cached needs pytest's cache directory (left out by -p no:cacheprovider)
+    if config.getoption("cached") and getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(_PassedTestCache(config), "passed-test-cache")
+
+
+def pytest_sessionfinish(session):
+    """On a pytest-xdist worker, send the verbose reporters' results to the controller.
+    
+    Each worker process has its own module-level reporters, so on its own a
+    reporter only sees the tests that ran on its worker.
+    """
+    workeroutput = getattr(session.config, 'workeroutput', None)
+    if workeroutput is None:
+        return
+    
+    results = {}
+    for module in {getattr(item, 'module', None) for item in session.items}:
+        recorded = getattr(getattr(module, 'reporter', None), 'results', None)
+        if recorded:
+            results[module.__name__] = [
+                (r.test_name, r.passed, str(r.error) if r.error else None) for r in recorded
+            ]
+    workeroutput['reporter_results'] = results
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the results a pytest-xdist worker sent back when it finished."""
+    worker_results = getattr(node, 'workeroutput', {}).get('reporter_results', {})
+    for module_name, results in worker_results.items():
+        node.config._worker_results.setdefault(module_name, []).extend(results)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print one verbose summary per test module, merged across pytest-xdist workers."""
+    for module_name, results in sorted(config._worker_results.items()):
+        passed = sum(1 for _, ok, _ in results if ok)
+        terminalreporter.write_sep("=", f"{module_name.upper()} SUMMARY (ALL WORKERS): {passed}/{len(results)} PASSED")
+        for test_name, ok, error in results:
+            if not ok:
+                terminalreporter.write_line(f"  - {test_name}: {error or 'Assertion failed'}")
+
+
+def _source_digest(root):
+    """Hash the project's and the tests' Python sources, which decide the test outcomes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted([*root.glob("*.py"), *(root / "tests").glob("*.py")]):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class _PassedTestCache:
+    """With --cached, skip the tests that passed in an earlier run against the same sources.
+    
+    Passing node IDs are kept in pytest's cache directory together with a
+    digest of the Python sources; any edit to them starts a fresh list.
+    Inputs outside those files (e.g. the installed git) aren't tracked,
+    so this is meant for local edit-and-rerun loops, not CI.
+    """
+    
+    KEY = "better_git_diff/passed"
+    
+    def __init__(self, config):
+        self.config = config
+        self.digest = _source_digest(config.rootpath)
+        stored = config.cache.get(self.KEY, {})
+        self.previously_passed = set(stored.get("passed", [])) if stored.get("digest") == self.digest else set()
+        self.passed = set()
+        self.failed = set()
+    
+    def pytest_collection_modifyitems(self, items):
+        skip = pytest.mark.skip(reason="passed before against the same sources (--cached)")
+        for item in items:
+            if item.nodeid in self.previously_passed:
+                item.add_marker(skip)
+    
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self.failed.add(report.nodeid)
+        elif report.when == "call" and report.passed:
+            self.passed.add(report.nodeid)
+    
+    def pytest_sessionfinish(self):
+        # Under pytest-xdist only the controller, which sees every report, writes
+        if hasattr(self.config, "workerinput"):
+            return
+        passed = (self.previously_passed | self.passed) - self.failed
+        self.config.cache.set(self.KEY, {"digest": self.digest, "passed": sorted(passed)})
+
+
+def _init_repo(path):
+    """Create an empty repository with a configured user, running only "git init"."""
+    from git import Repo
+    
+    repo = Repo.init(path)
+    
+    # Configure git user (required for commits), and keep the developer's
+    # global config from signing, converting or gc-ing in the git commands
+    # the tests run
+    config = repo.config_writer()
+    config.set_value("user", "name", "Test User")
+    config.set_value("user", "email", "test@example.com")
+    config.set_value("commit", "gpgsign", "false")
+    config.set_value("core", "autocrlf", "false")
+    config.set_value("gc", "auto", "0")
+    config.release()
+    
+    # Drop the hooks "git init" copies in (the sample ones, or any real ones
+    # from a global template), so index.commit can't run them and copies of
+    # the repository have a handful of files instead of a dozen more
+    hooks_dir = Path(repo.git_dir) / "hooks"
+    if hooks_dir.is_dir():
+        for hook in hooks_dir.iterdir():
+            hook.unlink()
+    
+    return repo
+
+
+# File versions committed by create_test_repo_with_history, oldest first
+_CALC_V1 = b'''def add(a, b):
+    """Add two numbers."""
+    return a + b
+'''
+
+_CALC_V2 = b'''def add(a, b):
+    """Add two numbers."""
+    return a + b
+
+def subtract(a, b):
+    """Subtract b from a."""
+    return a - b
+'''
+
+_CALC_V3 = b'''def add(a, b):
+    """Add two numbers with validation."""
+    if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
+        raise TypeError("Arguments must be numbers")
+    return a + b
+
+def subtract(a, b):
+    """Subtract b from a."""
+    return a - b
+'''
+
+_CALC_V4 = _CALC_V3 + b'''
+class Calculator:
+    """A simple calculator class."""
+    
+    def __init__(self):
+        self.result = 0
+    
+    def add(self, value):
+        """Add value to current result."""
+        self.result += value
+        return self.result
+    
+    def reset(self):
+        """Reset calculator to zero."""
+        self.result = 0
+'''
+
+_README = b"# Calculator Project\n\nA simple calculator implementation."
+
+# (path, content, message) for each commit of the test history
+_COMMIT_TABLE = [
+    ("calculator.py", _CALC_V1, "Initial commit - add function"),
+    ("calculator.py", _CALC_V2, "Add subtract function"),
+    ("calculator.py", _CALC_V3, "Add validation to add function"),
+    ("calculator.py", _CALC_V4, "Add Calculator class"),
+    ("README.md", _README, "Add README")
+]
+
+
+def _commit_file(index, rel_path, data, message):
+    """Commit new content for one file without touching the working tree.
+    
+    The blob goes straight into the object database and the index is only
+    updated in memory, so each commit costs one blob, tree and commit write.
+    """
+    from git.index.typ import BaseIndexEntry
+    from git.objects import Blob
+    from gitdb import IStream
+    
+    istream = index.repo.odb.store(IStream(Blob.type, len(data), BytesIO(data)))
+    index.add([BaseIndexEntry((Blob.file_mode, istream.binsha, 0, rel_path))], write=False)
+    return index.commit(message, skip_hooks=True)
+
+
+def create_test_repo_with_history(temp_dir):
+    """Create a test repository with multiple commits for testing."""
+    repo = _init_repo(temp_dir)
+    index = repo.index
+    
+    commits = []
+    final_contents = {}
+    for rel_path, data, message in _COMMIT_TABLE:
+        commits.append(_commit_file(index, rel_path, data, message))
+        final_contents[rel_path] = data
+    
+    # Only the final state is written out, to the index file and working tree
+    index.write()
+    for rel_path, data in final_contents.items():
+        (Path(temp_dir) / rel_path).write_bytes(data)
+    
+    return repo, commits
+
+
+@pytest.fixture(scope="session")
+def prebuilt_repo(tmp_path_factory):
+    """Build the test repository once per session.
+    
+    Returns:
+        Tuple of (repository path, commit SHAs oldest first)
+    """
+    temp_dir = tmp_path_factory.mktemp("src")
+    repo, commits = create_test_repo_with_history(str(temp_dir))
+    shas = [commit.hexsha for commit in commits]
+    repo.close()
+    return temp_dir, shas
+
+
+@pytest.fixture
+def git_repo_with_history(prebuilt_repo, tmp_path):
+    """Give each test its own copy of the prebuilt repository.
+    
+    Returns:
+        Tuple of (path of the copy as str, commit SHAs oldest first)
+    """
+    source_dir, shas = prebuilt_repo
+    repo_dir = tmp_path / "repo"
+    shutil.copytree(source_dir, repo_dir)
+    return str(repo_dir), shas
+
+
+@pytest.fixture(scope="session")
+def repo_template(tmp_path_factory):
+    """Initialise and configure an empty repository once per session, for empty_git_repo to copy."""
+    template_dir = tmp_path_factory.mktemp("template")
+    _init_repo(str(template_dir)).close()
+    return template_dir
+
+
+@pytest.fixture
+def empty_git_repo(repo_template, tmp_path):
+    """Give each test an empty repository with a configured user.
+    
+    The repository is copied from repo_template rather than created with
+    "git init", so no subprocess is started per test. It has no hooks, so
+    commits pass skip_hooks=True to skip looking them up.
+    
+    Returns:
+        Tuple of (repository path as str, Repo)
+    """
+    shutil.copytree(repo_template, tmp_path, dirs_exist_ok=True)
+    from git import Repo
+    
+    temp_dir = str(tmp_path)
+    return temp_dir, Repo(temp_dir)
+
+
+# A full object name: a commit's SHA fixes its tree and parents, so its diff
+# can't change, while a ref name such as "HEAD" can move
+_FULL_SHA_RE = re.compile(r'[0-9a-f]{40}|[0-9a-f]{64}')
+
+
+@pytest.fixture(scope="session")
+def commit_diff():
+    """Give the session a get_commit_diff that remembers diffs asked for by full SHA.
+    
+    The copies git_repo_with_history hands out share the prebuilt
+    repository's SHAs, so the key leaves the repository path out and a diff
+    one test produced is reused by the next. Ref names go to git every time.
+    Tests of get_commit_diff itself call it directly instead.
+    
+    Returns:
+        Function taking get_commit_diff's arguments
+    """
+    from git_operations import get_commit_diff
+    
+    diffs = {}
+    
+    def _diff(repo_path, commit_sha, parent_commit=None, as_bytes=False, paths=None):
+        if not (_FULL_SHA_RE.fullmatch(commit_sha) and (parent_commit is None or _FULL_SHA_RE.fullmatch(parent_commit))):
+            return get_commit_diff(repo_path, commit_sha, parent_commit, as_bytes, paths)
+        key = (commit_sha, parent_commit, as_bytes, tuple(paths or ()))
+        if key not in diffs:
+            diffs[key] = get_commit_diff(repo_path, commit_sha, parent_commit, as_bytes, paths)
+        return diffs[key]
+    
+    return _diff
+
+
+@pytest.fixture
+def two_commit_diff(empty_git_repo, commit_diff):
+    """Commit a file's before and after contents and parse the second commit's diff.
+    
+    Both versions are committed with _commit_file and the after contents
+    are handed to the parser directly, so nothing is written to or read
+    from the working tree.
+    
+    Returns:
+        Function taking (filename, before, after) as str and returning the
+        parsed EnhancedFileChange list
+    """
+    from function_aware_diff import parse_git_diff_with_functions
+    
+    temp_dir, repo = empty_git_repo
+    
+    def _make(filename, before, after):
+        index = repo.index
+        first_sha = _commit_file(index, filename, before.encode(), "Initial commit").hexsha
+        second_sha = _commit_file(index, filename, after.encode(), f"Update {filename}").hexsha
+        
+        diff_text = commit_diff(temp_dir, second_sha, first_sha)
+        return parse_git_diff_with_functions(diff_text, temp_dir, {filename: after})
+    
+    return _make
@@ -0,0 +1,359 @@
+"""Tests for parsing git diff output, which need no git repository."""
+
+import os
+import sys
+from io import BytesIO
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from diff_parser import parse_diff_output, parse_diff_stream
+
+
+class TestResult:
+    """Helper class to capture and format test results."""
+    def __init__(self, test_name, expected, actual, passed, error=None):
+        self.test_name = test_name
+        self.expected = expected
+        self.actual = actual
+        self.passed = passed
+        self.error = error
+    
+    def to_dict(self):
+        return {
+            "test_name": self.test_name,
+            "expected": self.expected,
+            "actual": self.actual,
+            "passed": self.passed,
+            "error": str(self.error) if self.error else None
+        }
+
+
+class VerboseTestReporter:
+    """Handles verbose test output when enabled."""
+    def __init__(self):
+        self.verbose = os.environ.get('PYTEST_VERBOSE', 'false').lower() == 'true'
+        self.results = []
+        # Set by pytest-xdist; each worker process has its own reporter
+        self.worker = os.environ.get('PYTEST_XDIST_WORKER')
+    
+    def record_result(self, test_name, expected, actual, passed, error=None):
+        result = TestResult(test_name, expected, actual, passed, error)
+        self.results.append(result)
+        
+        if self.verbose:
+            self._print_result(result)
+    
+    def _print_result(self, result):
+        print(f"\n{'='*60}")
+        print(f"TEST: {result.test_name}")
+        print(f"STATUS: {'PASS' if result.passed else 'FAIL'}")
+        print(f"{'='*60}")
+        
+        if not result.passed:
+            print(f"ERROR: {result.error}")
+        
+        print(f"EXPECTED: {result.expected}")
+        print(f"ACTUAL:   {result.actual}")
+        print(f"{'='*60}\n")
+    
+    def print_summary(self):
+        if self.verbose:
+            passed = sum(1 for r in self.results if r.passed)
+            total = len(self.results)
+            print(f"\n{'='*80}")
+            scope = f" ({self.worker})" if self.worker else ""
+            print(f"DIFF PARSER TEST SUMMARY{scope}: {passed}/{total} PASSED")
+            if passed < total:
+                print("FAILED TESTS:")
+                for r in self.results:
+                    if not r.passed:
+                        print(f"  - {r.test_name}: {r.error or 'Assertion failed'}")
+            print(f"{'='*80}")
+
+
+class NullTestReporter:
+    """Stands in for VerboseTestReporter when verbose output is off, keeping nothing."""
+    def record_result(self, test_name, expected, actual, passed, error=None):
+        pass
+    
+    def print_summary(self):
+        pass
+
+
+# Global reporter instance; results are only kept when they will be printed
+if os.environ.get('PYTEST_VERBOSE', 'false').lower() == 'true':
+    reporter = VerboseTestReporter()
+else:
+    reporter = NullTestReporter()
+
+
+# Sample diffs shared by the parametrized parsing test
+_SINGLE_FILE_DIFF = """diff --git a/test.py b/test.py
+index abc123..def456 100644
+--- a/test.py
++++ b/test.py
+@@ -1,3 +1,5 @@
+ def existing_function():
++    print("Debug message")
+     return True
++
++def new_function():
++    pass"""
+
+_MULTI_FILE_DIFF = """diff --git a/file1.py b/file1.py
+index abc123..def456 100644
+--- a/file1.py
++++ b/file1.py
+@@ -1,2 +1,3 @@
+ print("file1")
++print("modified file1")
+ # end file1
+diff --git a/file2.py b/file2.py
+index 123abc..456def 100644
+--- a/file2.py
++++ b/file2.py
+@@ -1,1 +1,2 @@
+ print("file2")
++print("modified file2")"""
+
+_COMPLEX_HUNK_DIFF = """diff --git a/complex.py b/complex.py
+index abc123..def456 100644
+--- a/complex.py
++++ b/complex.py
+@@ -1,5 +1,6 @@
+ def function1():
++    print("Added to function1")
+     return 1
+
+ def function2():
+@@ -10,8 +11,10 @@ def function2():
+ def function3():
+     return 3
+
++def new_function():
++    return "new"
++
+ # End of file"""
+
+_EMPTY_DIFF = ""
+
+_MALFORMED_DIFF = """This is not a valid diff
+Random text
+More random text"""
+
+
+# A quoted path with an escape git would never write (\1 isn't three octal digits)
+_MALFORMED_OCTAL_PATH_DIFF = """diff --git "a/\\19x.py" "b/\\19x.py"
+@@ -1 +1 @@
+-old
++new
+diff --git a/fine.py b/fine.py
+@@ -1 +1 @@
+-old
++new"""
+
+
+def _diff_facts(changes):
+    """Summarise parsed changes as file names and per-hunk start lines and additions."""
+    return {
+        "files": [change.new_file for change in changes],
+        "hunk_starts": [[hunk.new_start for hunk in change.hunks] for change in changes],
+        "added_lines": [
+            [sum(1 for line in hunk.lines if line.startswith('+')) for hunk in change.hunks]
+            for change in changes
+        ]
+    }
+
+
+# (name, diff, expected facts) for test_parse_variants
+_PARSE_CASES = [
+    ("single_file_diff", _SINGLE_FILE_DIFF,
+     {"files": ["test.py"], "hunk_starts": [[1]], "added_lines": [[4]]}),
+    ("multiple_file_diff", _MULTI_FILE_DIFF,
+     {"files": ["file1.py", "file2.py"], "hunk_starts": [[1], [1]], "added_lines": [[1], [1]]}),
+    ("diff_with_complex_hunks", _COMPLEX_HUNK_DIFF,
+     {"files": ["complex.py"], "hunk_starts": [[1, 11]], "added_lines": [[1, 3]]}),
+    # Empty and malformed input should be handled gracefully, returning no changes
+    ("empty_diff", _EMPTY_DIFF,
+     {"files": [], "hunk_starts": [], "added_lines": []}),
+    ("malformed_diff", _MALFORMED_DIFF,
+     {"files": [], "hunk_starts": [], "added_lines": []}),
+    # A malformed quoted header is skipped like any other unparseable header
+    ("malformed_octal_path", _MALFORMED_OCTAL_PATH_DIFF,
+     {"files": ["fine.py"], "hunk_starts": [[1]], "added_lines": [[1]]}),
+]
+
+
+class TestParseDiffOutput:
+    """Test diff parsing functionality."""
+    
+    @pytest.mark.parametrize("name, diff, expected", _PARSE_CASES, ids=[case[0] for case in _PARSE_CASES])
+    def test_parse_variants(self, name, diff, expected):
+        """Test parsing single-file, multi-file, multi-hunk, empty and malformed diffs."""
+        actual = _diff_facts(parse_diff_output(diff))
+        
+        passed = actual == expected
+        
+        reporter.record_result(
+            f"parse_{name}",
+            str(expected),
+            str(actual),
+            passed
+        )
+        
+        assert passed
+    
+    def test_parse_diff_with_header_like_content(self):
+        """Test that content lines resembling file headers stay in the hunk."""
+        sample_diff = """diff --git a/notes.py b/notes.py
+index abc123..def456 100644
+--- a/notes.py
++++ b/notes.py
+@@ -1,3 +1,3 @@
+ # header
+--- old separator
++++ new separator
+ # footer"""
+
+        changes = parse_diff_output(sample_diff)
+
+        expected = {"hunk_line_count": 4}
+        actual = {"hunk_line_count": len(changes[0].hunks[0].lines) if changes and changes[0].hunks else 0}
+
+        passed = (
+            len(changes) == 1 and
+            changes[0].hunks[0].lines == [" # header", "--- old separator", "+++ new separator", " # footer"]
+        )
+
+        reporter.record_result(
+            "parse_diff_with_header_like_content",
+            str(expected),
+            str(actual),
+            passed
+        )
+
+        assert passed
+
+    def test_parse_diff_hunk_counts(self):
+        """Test that added and removed line counts are recorded per hunk."""
+        sample_diff = """diff --git a/counts.py b/counts.py
+index abc123..def456 100644
+--- a/counts.py
++++ b/counts.py
+@@ -1,4 +1,5 @@
+ def f():
+-    return 1
++    x = 1
++    return x
+
+@@ -10,3 +11,2 @@
+ def g():
+-    pass
+-    pass"""
+
+        changes = parse_diff_output(sample_diff)
+        hunks = changes[0].hunks if changes else []
+
+        expected = {"counts": [(2, 1), (0, 2)]}
+        actual = {"counts": [(h.added_count, h.removed_count) for h in hunks]}
+
+        passed = actual == expected
+
+        reporter.record_result(
+            "parse_diff_hunk_counts",
+            str(expected),
+            str(actual),
+            passed
+        )
+
+        assert passed
+
+    def test_parse_diff_with_stray_carriage_return(self):
+        """Test that \\r stays part of the line, lone or before \\n, with the full and streamed parsers alike."""
+        sample_diff = (
+            # Converting a line to CRLF must stay visible as a change
+            b'diff --git a/crlf.py b/crlf.py\n'
+            b'index 123abc..456def 100644\n'
+            b'--- a/crlf.py\n'
+            b'+++ b/crlf.py\n'
+            b'@@ -1 +1 @@\n'
+            b'-x = 1\n'
+            b'+x = 1\r\n'
+            b'diff --git a/strings.py b/strings.py\n'
+            b'index abc123..def456 100644\n'
+            b'--- a/strings.py\n'
+            b'+++ b/strings.py\n'
+            b'@@ -1,3 +1,3 @@\n'
+            b' s = "a\rb"\n'
+            b'-t = 1\n'
+            b'+t = 2\n'
+            b' u = 3\n'
+        )
+
+        full_lines = [hunk.lines for change in parse_diff_output(sample_diff) for hunk in change.hunks]
+        # Reading a binary file, like a git pipe, splits on "\n" only
+        stream_lines = [hunk.lines for change in parse_diff_stream(BytesIO(sample_diff)) for hunk in change.hunks]
+
+        expected = [['-x = 1', '+x = 1\r'], [' s = "a\rb"', '-t = 1', '+t = 2', ' u = 3']]
+
+        passed = full_lines == expected and stream_lines == full_lines
+
+        reporter.record_result(
+            "parse_diff_with_stray_carriage_return",
+            str(expected),
+            f"full: {full_lines}, streamed: {stream_lines}",
+            passed
+        )
+
+        assert passed
+
+    def test_parse_diff_with_unusual_paths(self):
+        """Test parsing file headers with spaces, renames and git-quoted paths."""
+        sample_diff = """diff --git a/my dir b/notes.py b/my dir b/notes.py
+index abc123..def456 100644
+@@ -1 +1 @@
+-old
++new
+diff --git a/old name.py b/new name.py
+similarity index 90%
+rename from old name.py
+rename to new name.py
+diff --git "a/caf\\303\\251\\tx.py" "b/caf\\303\\251\\tx.py"
+index abc123..def456 100644
+@@ -1 +1 @@
+-old
++new"""
+
+        changes = parse_diff_output(sample_diff)
+
+        expected = [
+            ("my dir b/notes.py", "my dir b/notes.py"),
+            ("old name.py", "new name.py"),
+            ("café\tx.py", "café\tx.py")
+        ]
+        actual = [(change.old_file, change.new_file) for change in changes]
+
+        passed = actual == expected
+
+        reporter.record_result(
+            "parse_diff_with_unusual_paths",
+            str(expected),
+            str(actual),
+            passed
+        )
+
+        assert passed
+
+
+@pytest.fixture(scope="module", autouse=True)
+def print_test_summary():
+    """Print test summary after all tests in the module (or xdist worker) complete."""
+    yield
+    reporter.print_summary()
+
+
+# This allows the tests to be run with: python -m pytest tests/test_diff_parser.py::test_function_name -v
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
\ No newline at end of file
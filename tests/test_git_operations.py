@@ -1,10 +1,8 @@
-"""Enhanced tests for git operations with Windows-compatible cleanup and verbose output."""
+"""Enhanced tests for git operations with verbose output."""
 
-import tempfile
 import os
 import sys
-import shutil
-import stat
+import tempfile
 from pathlib import Path
 import pytest
 from git import Repo
@@ -12,8 +10,8 @@ from git import Repo
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from git_operations import clone_repository, get_commit_diff
-from diff_parser import parse_diff_output, FileChange, DiffHunk
+from git_operations import clone_repository, get_commit_diff, iter_commit_diff_lines
+from diff_parser import parse_diff_output, parse_diff_stream, FileChange, DiffHunk
 
 
 class TestResult:
@@ -40,6 +38,8 @@ class VerboseTestReporter:
     def __init__(self):
         self.verbose = os.environ.get('PYTEST_VERBOSE', 'false').lower() == 'true'
         self.results = []
+        # Set by pytest-xdist; each worker process has its own reporter
+        self.worker = os.environ.get('PYTEST_XDIST_WORKER')
     
     def record_result(self, test_name, expected, actual, passed, error=None):
         result = TestResult(test_name, expected, actual, passed, error)
@@ -49,258 +49,125 @@ class VerboseTestReporter:
             self._print_result(result)
     
     def _print_result(self, result):
-        print(f"\n{'='*60}")
-        print(f"TEST: {result.test_name}")
-        print(f"STATUS: {'PASS' if result.passed else 'FAIL'}")
-        print(f"{'='*60}")
+        # Built up and written in one go rather than a print per line
+        separator = '=' * 60
+        lines = [
+            f"\n{separator}",
+            f"TEST: {result.test_name}",
+            f"STATUS: {'PASS' if result.passed else 'FAIL'}",
+            separator
+        ]
         
         if not result.passed:
-            print(f"ERROR: {result.error}")
+            lines.append(f"ERROR: {result.error}")
+        
+        lines.append(f"EXPECTED: {result.expected}")
+        lines.append(f"ACTUAL:   {result.actual}")
+        lines.append(f"{separator}\n")
         
-        print(f"EXPECTED: {result.expected}")
-        print(f"ACTUAL:   {result.actual}")
-        print(f"{'='*60}\n")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def print_summary(self):
         if self.verbose:
             passed = sum(1 for r in self.results if r.passed)
             total = len(self.results)
-            print(f"\n{'='*80}")
-            print(f"GIT OPERATIONS TEST SUMMARY: {passed}/{total} PASSED")
+            scope = f" ({self.worker})" if self.worker else ""
+            lines = [
+                f"\n{'='*80}",
+                f"GIT OPERATIONS TEST SUMMARY{scope}: {passed}/{total} PASSED"
+            ]
             if passed < total:
-                print("FAILED TESTS:")
-                for r in self.results:
-                    if not r.passed:
-                        print(f"  - {r.test_name}: {r.error or 'Assertion failed'}")
-            print(f"{'='*80}")
-
-
-# Global reporter instance
-reporter = VerboseTestReporter()
+                lines.append("FAILED TESTS:")
+                lines.extend(
+                    f"  - {r.test_name}: {r.error or 'Assertion failed'}"
+                    for r in self.results if not r.passed
+                )
+            lines.append('=' * 80)
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
-def remove_readonly(func, path, _):
-    """Error handler for Windows readonly files."""
-    try:
-        os.chmod(path, stat.S_IWRITE)
-        func(path)
-    except Exception:
+class NullTestReporter:
+    """Stands in for VerboseTestReporter when verbose output is off, keeping nothing."""
+    def record_result(self, test_name, expected, actual, passed, error=None):
         pass
-
-
-def safe_cleanup(temp_dir):
-    """Safely clean up temporary directory on Windows."""
-    if os.path.exists(temp_dir):
-        try:
-            # First, try to close any Git repositories
-            for root, dirs, files in os.walk(temp_dir):
-                if '.git' in dirs:
-                    git_dir = os.path.join(root, '.git')
-                    # Make all files writable
-                    for git_root, git_dirs, git_files in os.walk(git_dir):
-                        for file in git_files:
-                            file_path = os.path.join(git_root, file)
-                            if os.path.exists(file_path):
-                                os.chmod(file_path, stat.S_IWRITE)
-            
-            # Remove with error handler
-            shutil.rmtree(temp_dir, onerror=remove_readonly)
-        except Exception:
-            # If all else fails, try system rmdir on Windows
-            if os.name == 'nt':
-                try:
-                    os.system(f'rmdir /s /q "{temp_dir}"')
-                except Exception:
-                    pass
-
-
-def create_test_repo_with_history(temp_dir):
-    """Create a test repository with multiple commits for testing."""
-    repo = Repo.init(temp_dir)
-    
-    # Configure git user (required for commits)
-    repo.config_writer().set_value("user", "name", "Test User").release()
-    repo.config_writer().set_value("user", "email", "test@example.com").release()
     
-    commits = []
-    
-    # Commit 1: Initial Python file
-    python_file = Path(temp_dir) / "calculator.py"
-    python_file.write_text('''def add(a, b):
-    """Add two numbers."""
-    return a + b
-''')
-    repo.index.add([str(python_file)])
-    commits.append(repo.index.commit("Initial commit - add function"))
-    
-    # Commit 2: Add another function
-    python_file.write_text('''def add(a, b):
-    """Add two numbers."""
-    return a + b
+    def print_summary(self):
+        pass
 
-def subtract(a, b):
-    """Subtract b from a."""
-    return a - b
-''')
-    repo.index.add([str(python_file)])
-    commits.append(repo.index.commit("Add subtract function"))
-    
-    # Commit 3: Modify existing function
-    python_file.write_text('''def add(a, b):
-    """Add two numbers with validation."""
-    if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-        raise TypeError("Arguments must be numbers")
-    return a + b
 
-def subtract(a, b):
-    """Subtract b from a."""
-    return a - b
-''')
-    repo.index.add([str(python_file)])
-    commits.append(repo.index.commit("Add validation to add function"))
-    
-    # Commit 4: Add a class
-    python_file.write_text('''def add(a, b):
-    """Add two numbers with validation."""
-    if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-        raise TypeError("Arguments must be numbers")
-    return a + b
-
-def subtract(a, b):
-    """Subtract b from a."""
-    return a - b
-
-class Calculator:
-    """A simple calculator class."""
-    
-    def __init__(self):
-        self.result = 0
-    
-    def add(self, value):
-        """Add value to current result."""
-        self.result += value
-        return self.result
-    
-    def reset(self):
-        """Reset calculator to zero."""
-        self.result = 0
-''')
-    repo.index.add([str(python_file)])
-    commits.append(repo.index.commit("Add Calculator class"))
-    
-    # Commit 5: Add non-Python file
-    readme_file = Path(temp_dir) / "README.md"
-    readme_file.write_text("# Calculator Project\n\nA simple calculator implementation.")
-    repo.index.add([str(readme_file)])
-    commits.append(repo.index.commit("Add README"))
-    
-    return repo, commits
+# Global reporter instance; results are only kept when they will be printed
+if os.environ.get('PYTEST_VERBOSE', 'false').lower() == 'true':
+    reporter = VerboseTestReporter()
+else:
+    reporter = NullTestReporter()
 
 
 class TestCloneRepository:
     """Test repository cloning functionality."""
     
-    def test_clone_repository_to_temp_dir(self):
-        """Test cloning a repository to a temporary directory."""
-        source_temp_dir = tempfile.mkdtemp()
-        clone_temp_dir = None
+    @pytest.mark.parametrize("dest_mode", ["explicit", "auto"])
+    def test_clone_repository(self, prebuilt_repo, tmp_path, monkeypatch, dest_mode):
+        """Test cloning into a given directory and into one clone_repository creates."""
+        test_name = "clone_repository_to_temp_dir" if dest_mode == "explicit" else "clone_repository_auto_temp_dir"
+        source_dir, shas = prebuilt_repo
         
         try:
-            # Create source repo
-            repo, commits = create_test_repo_with_history(source_temp_dir)
-            expected_commits = len(commits)
-            
-            # Clone it
-            clone_temp_dir = tempfile.mkdtemp()
-            result_dir = clone_repository(source_temp_dir, clone_temp_dir)
+            # Cloning only reads the source, so the shared prebuilt repo is used directly
+            target_dir = str(tmp_path / "clone") if dest_mode == "explicit" else None
+            if target_dir is None:
+                # Have the directory clone_repository creates land in tmp_path, which pytest removes
+                monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+            result_dir = clone_repository(str(source_dir), target_dir)
             
             # Verify
-            assert result_dir == clone_temp_dir
-            assert os.path.exists(result_dir)
-            assert os.path.exists(os.path.join(result_dir, "calculator.py"))
+            assert result_dir is not None
+            if target_dir is not None:
+                assert result_dir == target_dir
+            else:
+                assert Path(result_dir).parent == tmp_path
             
             cloned_repo = Repo(result_dir)
-            actual_commits = len(list(cloned_repo.iter_commits()))
+            head_sha = cloned_repo.head.commit.hexsha
+            history = cloned_repo.git.rev_list('--reverse', 'HEAD').split()
+            # Release the repository's handles so the clone can be removed on Windows
+            cloned_repo.close()
+            
+            tracked_files = ["calculator.py", "README.md"]
+            expected = {"head": shas[-1], "history": shas, "files": {name: True for name in tracked_files}}
+            actual = {
+                "head": head_sha,
+                "history": history,
+                "files": {
+                    name: (Path(result_dir) / name).read_bytes() == (Path(source_dir) / name).read_bytes()
+                    for name in tracked_files
+                }
+            }
+            passed = actual == expected
+            
+            reporter.record_result(test_name, expected, actual, passed)
             
-            reporter.record_result(
-                "clone_repository_to_temp_dir",
-                f"Cloned repo with {expected_commits} commits",
-                f"Cloned repo with {actual_commits} commits",
-                actual_commits == expected_commits
-            )
-            
-            assert actual_commits == expected_commits
+            assert passed
             
         except Exception as e:
             reporter.record_result(
-                "clone_repository_to_temp_dir",
+                test_name,
                 "Successful clone",
                 f"Failed with error: {e}",
                 False,
                 e
             )
             raise
-        finally:
-            safe_cleanup(source_temp_dir)
-            if clone_temp_dir:
-                safe_cleanup(clone_temp_dir)
-    
-    def test_clone_repository_auto_temp_dir(self):
-        """Test cloning to automatically created temp directory."""
-        source_temp_dir = tempfile.mkdtemp()
-        clone_dir = None
-        
-        try:
-            # Create source repo
-            repo, commits = create_test_repo_with_history(source_temp_dir)
-            
-            # Clone without specifying target
-            clone_dir = clone_repository(source_temp_dir)
-            
-            # Verify
-            assert clone_dir is not None
-            assert os.path.exists(clone_dir)
-            assert os.path.exists(os.path.join(clone_dir, "calculator.py"))
-            
-            cloned_repo = Repo(clone_dir)
-            commit_count = len(list(cloned_repo.iter_commits()))
-            expected_count = len(commits)
-            
-            reporter.record_result(
-                "clone_repository_auto_temp_dir",
-                f"Auto-created temp dir with {expected_count} commits",
-                f"Created {clone_dir} with {commit_count} commits",
-                commit_count == expected_count and os.path.exists(clone_dir)
-            )
-            
-            assert commit_count == expected_count
-            
-        except Exception as e:
-            reporter.record_result(
-                "clone_repository_auto_temp_dir",
-                "Successful auto-clone",
-                f"Failed with error: {e}",
-                False,
-                e
-            )
-            raise
-        finally:
-            safe_cleanup(source_temp_dir)
-            if clone_dir:
-                safe_cleanup(clone_dir)
 
 
 class TestGetCommitDiff:
     """Test commit diff retrieval functionality."""
     
-    def test_get_commit_diff_basic(self):
+    def test_get_commit_diff_basic(self, git_repo_with_history):
         """Test getting diff for a basic commit."""
-        temp_dir = tempfile.mkdtemp()
+        temp_dir, shas = git_repo_with_history
         try:
-            repo, commits = create_test_repo_with_history(temp_dir)
-            
             # Get diff for the second commit (adds subtract function)
-            diff = get_commit_diff(temp_dir, commits[1].hexsha)
+            diff = get_commit_diff(temp_dir, shas[1])
             
             expected_content = [
                 "calculator.py",
@@ -329,17 +196,13 @@ class TestGetCommitDiff:
                 e
             )
             raise
-        finally:
-            safe_cleanup(temp_dir)
     
-    def test_get_commit_diff_with_parent(self):
+    def test_get_commit_diff_with_parent(self, git_repo_with_history):
         """Test getting diff between specific commits."""
-        temp_dir = tempfile.mkdtemp()
+        temp_dir, shas = git_repo_with_history
         try:
-            repo, commits = create_test_repo_with_history(temp_dir)
-            
             # Get diff between first and third commit
-            diff = get_commit_diff(temp_dir, commits[2].hexsha, commits[0].hexsha)
+            diff = get_commit_diff(temp_dir, shas[2], shas[0])
             
             # Should show both the subtract function addition and add function modification
             expected_additions = [
@@ -367,22 +230,142 @@ class TestGetCommitDiff:
                 e
             )
             raise
-        finally:
-            safe_cleanup(temp_dir)
     
-    def test_get_commit_diff_initial_commit(self):
-        """Test getting diff for initial commit (no parent)."""
-        temp_dir = tempfile.mkdtemp()
+    def test_get_commit_diff_as_bytes(self, git_repo_with_history):
+        """Test that the bytes diff parses the same as the decoded diff."""
+        temp_dir, shas = git_repo_with_history
+        try:
+            text_diff = get_commit_diff(temp_dir, shas[2])
+            bytes_diff = get_commit_diff(temp_dir, shas[2], as_bytes=True)
+
+            text_changes = parse_diff_output(text_diff)
+            bytes_changes = parse_diff_output(bytes_diff)
+
+            passed = (
+                isinstance(bytes_diff, bytes) and
+                bytes_diff.decode('utf-8') == text_diff and
+                bytes_changes == text_changes
+            )
+
+            reporter.record_result(
+                "get_commit_diff_as_bytes",
+                "Bytes diff parses identically to str diff",
+                f"Type: {type(bytes_diff).__name__}, identical parse: {bytes_changes == text_changes}",
+                passed
+            )
+
+            assert passed
+
+        except Exception as e:
+            reporter.record_result(
+                "get_commit_diff_as_bytes",
+                "Valid bytes diff",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+
+    def test_iter_commit_diff_lines(self, git_repo_with_history, commit_diff):
+        """Test that the streamed diff parses the same as the full diff."""
+        temp_dir, shas = git_repo_with_history
         try:
-            repo = Repo.init(temp_dir)
-            repo.config_writer().set_value("user", "name", "Test User").release()
-            repo.config_writer().set_value("user", "email", "test@example.com").release()
+            all_identical = True
+            for sha in (shas[0], shas[3]):
+                text_changes = parse_diff_output(commit_diff(temp_dir, sha))
+                stream_changes = parse_diff_stream(iter_commit_diff_lines(temp_dir, sha))
+                all_identical = all_identical and stream_changes == text_changes and len(stream_changes) == 1
+
+            reporter.record_result(
+                "iter_commit_diff_lines",
+                "Streamed diffs parse identically to full diffs",
+                f"Identical parse: {all_identical}",
+                all_identical
+            )
+
+            assert all_identical
+
+        except Exception as e:
+            reporter.record_result(
+                "iter_commit_diff_lines",
+                "Valid streamed diff",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+
+    def test_commit_diff_fixture_cached(self, commit_diff, git_repo_with_history, prebuilt_repo):
+        """Test that the commit_diff fixture shares diffs asked for by full SHA and not by ref name."""
+        temp_dir, shas = git_repo_with_history
+        source_dir, _ = prebuilt_repo
+        try:
+            first = commit_diff(temp_dir, shas[1])
+            # Another copy of the same history has the same SHAs
+            from_source = commit_diff(str(source_dir), shas[1])
+            head_diff = commit_diff(temp_dir, "HEAD")
+            
+            expected = {"shared_across_copies": True, "matches_git": True, "head_matches_git": True}
+            actual = {
+                "shared_across_copies": from_source is first,
+                "matches_git": first == get_commit_diff(temp_dir, shas[1]),
+                "head_matches_git": head_diff == get_commit_diff(temp_dir, shas[-1])
+            }
+            passed = actual == expected
+            
+            reporter.record_result("commit_diff_fixture_cached", expected, actual, passed)
+            
+            assert passed
+            
+        except Exception as e:
+            reporter.record_result(
+                "commit_diff_fixture_cached",
+                "Cached diff for a full SHA",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+    
+    def test_get_commit_diff_paths(self, git_repo_with_history):
+        """Test that pathspecs limit both the full and the streamed diff to matching files."""
+        temp_dir, shas = git_repo_with_history
+        try:
+            def changed_files(changes):
+                return [c.new_file for c in changes]
+            
+            # The first and last commits differ in calculator.py and README.md
+            expected = {"all": ["README.md", "calculator.py"], "python": ["calculator.py"], "streamed": ["calculator.py"]}
+            actual = {
+                "all": changed_files(parse_diff_output(get_commit_diff(temp_dir, shas[-1], shas[0]))),
+                "python": changed_files(parse_diff_output(get_commit_diff(temp_dir, shas[-1], shas[0], paths=["*.py"]))),
+                "streamed": changed_files(parse_diff_stream(iter_commit_diff_lines(temp_dir, shas[-1], shas[0], paths=["*.py"])))
+            }
+            passed = actual == expected
+            
+            reporter.record_result("get_commit_diff_paths", expected, actual, passed)
+            
+            assert passed
             
+        except Exception as e:
+            reporter.record_result(
+                "get_commit_diff_paths",
+                "Diff limited to the given paths",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+    
+    def test_get_commit_diff_initial_commit(self, empty_git_repo):
+        """Test getting diff for initial commit (no parent)."""
+        temp_dir, repo = empty_git_repo
+        try:
             # Create initial file
             test_file = Path(temp_dir) / "initial.py"
             test_file.write_text("print('Hello, World!')")
             repo.index.add([str(test_file)])
-            initial_commit = repo.index.commit("Initial commit")
+            initial_commit = repo.index.commit("Initial commit", skip_hooks=True)
             
             # Get diff for initial commit
             diff = get_commit_diff(temp_dir, initial_commit.hexsha)
@@ -408,218 +391,11 @@ class TestGetCommitDiff:
                 e
             )
             raise
-        finally:
-            safe_cleanup(temp_dir)
-
-
-class TestParseDiffOutput:
-    """Test diff parsing functionality."""
-    
-    def test_parse_single_file_diff(self):
-        """Test parsing diff for a single file."""
-        sample_diff = """diff --git a/test.py b/test.py
-index abc123..def456 100644
---- a/test.py
-+++ b/test.py
-@@ -1,3 +1,5 @@
- def existing_function():
-+    print("Debug message")
-     return True
-+
-+def new_function():
-+    pass"""
-        
-        changes = parse_diff_output(sample_diff)
-        
-        expected = {
-            "file_count": 1,
-            "file_name": "test.py",
-            "hunk_count": 1,
-            "added_lines": 4
-        }
-        
-        actual = {
-            "file_count": len(changes),
-            "file_name": changes[0].new_file if changes else None,
-            "hunk_count": len(changes[0].hunks) if changes else 0,
-            "added_lines": sum(1 for line in changes[0].hunks[0].lines if line.startswith('+')) if changes and changes[0].hunks else 0
-        }
-        
-        passed = (
-            len(changes) == 1 and
-            changes[0].new_file == "test.py" and
-            len(changes[0].hunks) == 1 and
-            sum(1 for line in changes[0].hunks[0].lines if line.startswith('+')) == 4
-        )
-        
-        reporter.record_result(
-            "parse_single_file_diff",
-            str(expected),
-            str(actual),
-            passed
-        )
-        
-        assert passed
-    
-    def test_parse_multiple_file_diff(self):
-        """Test parsing diff for multiple files."""
-        sample_diff = """diff --git a/file1.py b/file1.py
-index abc123..def456 100644
---- a/file1.py
-+++ b/file1.py
-@@ -1,2 +1,3 @@
- print("file1")
-+print("modified file1")
- # end file1
-diff --git a/file2.py b/file2.py
-index 123abc..456def 100644
---- a/file2.py
-+++ b/file2.py
-@@ -1,1 +1,2 @@
- print("file2")
-+print("modified file2")"""
-        
-        changes = parse_diff_output(sample_diff)
-        
-        expected = {
-            "file_count": 2,
-            "files": ["file1.py", "file2.py"],
-            "total_hunks": 2
-        }
-        
-        actual_files = [change.new_file for change in changes]
-        actual = {
-            "file_count": len(changes),
-            "files": actual_files,
-            "total_hunks": sum(len(change.hunks) for change in changes)
-        }
-        
-        passed = (
-            len(changes) == 2 and
-            "file1.py" in actual_files and
-            "file2.py" in actual_files and
-            sum(len(change.hunks) for change in changes) == 2
-        )
-        
-        reporter.record_result(
-            "parse_multiple_file_diff",
-            str(expected),
-            str(actual),
-            passed
-        )
-        
-        assert passed
-    
-    def test_parse_diff_with_complex_hunks(self):
-        """Test parsing diff with multiple hunks in one file."""
-        sample_diff = """diff --git a/complex.py b/complex.py
-index abc123..def456 100644
---- a/complex.py
-+++ b/complex.py
-@@ -1,5 +1,6 @@
- def function1():
-+    print("Added to function1")
-     return 1
-
- def function2():
-@@ -10,8 +11,10 @@ def function2():
- def function3():
-     return 3
-
-+def new_function():
-+    return "new"
-+
- # End of file"""
-        
-        changes = parse_diff_output(sample_diff)
-        
-        expected = {
-            "file_count": 1,
-            "hunk_count": 2,
-            "first_hunk_start": 1,
-            "second_hunk_start": 11
-        }
-        
-        actual = {
-            "file_count": len(changes),
-            "hunk_count": len(changes[0].hunks) if changes else 0,
-            "first_hunk_start": changes[0].hunks[0].new_start if changes and changes[0].hunks else None,
-            "second_hunk_start": changes[0].hunks[1].new_start if changes and len(changes[0].hunks) > 1 else None
-        }
-        print(actual) #this is last error for now*
-        
-        passed = (
-            len(changes) == 1 and
-            len(changes[0].hunks) == 2 and
-            changes[0].hunks[0].new_start == 1 and
-            changes[0].hunks[1].new_start == 11
-        )
-        
-        reporter.record_result(
-            "parse_diff_with_complex_hunks",
-            str(expected),
-            str(actual),
-            passed
-        )
-        
-        assert passed
-    
-    def test_parse_empty_diff(self):
-        """Test parsing empty diff."""
-        empty_diff = ""
-        changes = parse_diff_output(empty_diff)
-        
-        expected = {"file_count": 0}
-        actual = {"file_count": len(changes)}
-        
-        passed = len(changes) == 0
-        
-        reporter.record_result(
-            "parse_empty_diff",
-            str(expected),
-            str(actual),
-            passed
-        )
-        
-        assert passed
-    
-    def test_parse_malformed_diff(self):
-        """Test parsing malformed diff (should handle gracefully)."""
-        malformed_diff = """This is not a valid diff
-Random text
-More random text"""
-        
-        try:
-            changes = parse_diff_output(malformed_diff)
-            
-            # Should return empty list for malformed input
-            expected = {"file_count": 0}
-            actual = {"file_count": len(changes)}
-            passed = len(changes) == 0
-            
-            reporter.record_result(
-                "parse_malformed_diff",
-                str(expected),
-                str(actual),
-                passed
-            )
-            
-            assert passed
-            
-        except Exception as e:
-            reporter.record_result(
-                "parse_malformed_diff",
-                "Graceful handling of malformed diff",
-                f"Exception raised: {e}",
-                False,
-                e
-            )
-            raise
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def print_test_summary():
-    """Print test summary after all tests complete."""
+    """Print test summary after all tests in the module (or xdist worker) complete."""
     yield
     reporter.print_summary()
 
@@ -1,21 +1,27 @@
 """Enhanced tests for Python function detection and function-aware diff parsing with verbose output."""
 
-import tempfile
+import asyncio
 import os
 import sys
-import shutil
-import stat
 from pathlib import Path
 import pytest
-from git import Repo
 import json
 
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from python_function_detector import PythonFunctionDetector, PythonFunction
-from function_aware_diff import FunctionAwareDiffParser, parse_git_diff_with_functions, FunctionChange
+from python_function_detector import (
+    PythonFunctionDetector,
+    PythonFunction,
+    detect_python_functions_in_files,
+    detect_python_functions_in_files_async
+)
+import function_aware_diff
+from function_aware_diff import (
+    FunctionAwareDiffParser, parse_git_diff_with_functions, reset_default_parser, FunctionChange
+)
 from git_operations import get_commit_diff
+from diff_parser import DiffHunk
 
 
 class FunctionTestResult:
@@ -42,6 +48,8 @@ class VerboseTestReporter:
     def __init__(self):
         self.verbose = os.environ.get('PYTEST_VERBOSE', 'false').lower() == 'true'
         self.results = []
+        # Set by pytest-xdist; each worker process has its own reporter
+        self.worker = os.environ.get('PYTEST_XDIST_WORKER')
     
     def record_result(self, test_name, expected, actual, passed, error=None):
         result = FunctionTestResult(test_name, expected, actual, passed, error)  # Changed here
@@ -51,84 +59,71 @@ class VerboseTestReporter:
             self._print_result(result)
     
     def _print_result(self, result):
-        print(f"\n{'='*80}")
-        print(f"TEST: {result.test_name}")
-        print(f"STATUS: {'PASS' if result.passed else 'FAIL'}")
-        print(f"{'='*80}")
+        # Built up and written in one go rather than a print per line
+        separator = '=' * 80
+        lines = [
+            f"\n{separator}",
+            f"TEST: {result.test_name}",
+            f"STATUS: {'PASS' if result.passed else 'FAIL'}",
+            separator
+        ]
         
         if not result.passed and result.error:
-            print(f"ERROR: {result.error}")
-        
-        print("EXPECTED:")
-        if isinstance(result.expected, dict):
-            for key, value in result.expected.items():
-                print(f"  {key}: {value}")
-        else:
-            print(f"  {result.expected}")
-        
-        print("ACTUAL:")
-        if isinstance(result.actual, dict):
-            for key, value in result.actual.items():
-                print(f"  {key}: {value}")
-        else:
-            print(f"  {result.actual}")
-        print(f"{'='*80}\n")
+            lines.append(f"ERROR: {result.error}")
+        
+        for label, value in (("EXPECTED:", result.expected), ("ACTUAL:", result.actual)):
+            lines.append(label)
+            if isinstance(value, dict):
+                lines.extend(f"  {key}: {item}" for key, item in value.items())
+            else:
+                lines.append(f"  {value}")
+        lines.append(f"{separator}\n")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def print_summary(self):
         if self.verbose:
             passed = sum(1 for r in self.results if r.passed)
             total = len(self.results)
-            print(f"\n{'='*80}")
-            print(f"FUNCTION DETECTION TEST SUMMARY: {passed}/{total} PASSED")
+            scope = f" ({self.worker})" if self.worker else ""
+            lines = [
+                f"\n{'='*80}",
+                f"FUNCTION DETECTION TEST SUMMARY{scope}: {passed}/{total} PASSED"
+            ]
             if passed < total:
-                print("FAILED TESTS:")
-                for r in self.results:
-                    if not r.passed:
-                        print(f"  - {r.test_name}: {r.error or 'Assertion failed'}")
-            print(f"{'='*80}")
+                lines.append("FAILED TESTS:")
+                lines.extend(
+                    f"  - {r.test_name}: {r.error or 'Assertion failed'}"
+                    for r in self.results if not r.passed
+                )
+            lines.append('=' * 80)
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
-# Global reporter instance
-reporter = VerboseTestReporter()
+class NullTestReporter:
+    """Stands in for VerboseTestReporter when verbose output is off, keeping nothing."""
+    def record_result(self, test_name, expected, actual, passed, error=None):
+        pass
+    
+    def print_summary(self):
+        pass
 
 
-def remove_readonly(func, path, _):
-    """Error handler for Windows readonly files."""
-    try:
-        os.chmod(path, stat.S_IWRITE)
-        func(path)
-    except Exception:
-        pass
+# Global reporter instance; results are only kept when they will be printed
+if os.environ.get('PYTEST_VERBOSE', 'false').lower() == 'true':
+    reporter = VerboseTestReporter()
+else:
+    reporter = NullTestReporter()
 
 
-def safe_cleanup(temp_dir):
-    """Safely clean up temporary directory on Windows."""
-    if os.path.exists(temp_dir):
-        try:
-            for root, dirs, files in os.walk(temp_dir):
-                if '.git' in dirs:
-                    git_dir = os.path.join(root, '.git')
-                    for git_root, git_dirs, git_files in os.walk(git_dir):
-                        for file in git_files:
-                            file_path = os.path.join(git_root, file)
-                            if os.path.exists(file_path):
-                                os.chmod(file_path, stat.S_IWRITE)
-            
-            shutil.rmtree(temp_dir, onerror=remove_readonly)
-        except Exception:
-            if os.name == 'nt':
-                try:
-                    os.system(f'rmdir /s /q "{temp_dir}"')
-                except Exception:
-                    pass
+@pytest.fixture(scope="module")
+def detector():
+    """One detector shared by the detection tests, so they also share its content cache."""
+    return PythonFunctionDetector()
 
 
-class TestPythonFunctionDetector:
-    """Enhanced test cases for Python function detection."""
-    
-    def test_detect_simple_functions(self):
-        """Test detecting simple Python functions."""
-        python_code = '''
+# Sources for the detection tests
+_SIMPLE_FUNCTIONS_SOURCE = '''
 def simple_function():
     """A simple function."""
     print("Hello World")
@@ -139,37 +134,9 @@ def another_function(param1, param2="default"):
     result = param1 + len(param2)
     return result
 '''
-        detector = PythonFunctionDetector()
-        functions = detector.detect_functions(python_code)
-        
-        expected = {
-            "function_count": 2,
-            "function_names": ["simple_function", "another_function"],
-            "all_are_functions": True,
-            "none_are_methods": True
-        }
-        
-        function_names = [func.name for func in functions]
-        actual = {
-            "function_count": len(functions),
-            "function_names": function_names,
-            "all_are_functions": all(not func.is_method for func in functions),
-            "none_are_methods": all(func.class_name is None for func in functions)
-        }
-        
-        passed = (
-            len(functions) == 2 and
-            set(function_names) == {"simple_function", "another_function"} and
-            all(not func.is_method for func in functions) and
-            all(func.class_name is None for func in functions)
-        )
-        
-        reporter.record_result("detect_simple_functions", expected, actual, passed)
-        assert passed
-    
-    def test_detect_async_functions(self):
-        """Test detecting async functions with various patterns."""
-        python_code = '''
+_SIMPLE_FUNCTION_NAMES = frozenset({"simple_function", "another_function"})
+
+_ASYNC_FUNCTIONS_SOURCE = '''
 import asyncio
 
 async def simple_async():
@@ -191,42 +158,10 @@ async def async_generator():
     for i in range(10):
         yield await asyncio.sleep(0.1, result=i)
 '''
-        detector = PythonFunctionDetector()
-        functions = detector.detect_functions(python_code)
-        
-        async_functions = [f for f in functions if f.is_async]
-        sync_functions = [f for f in functions if not f.is_async]
-        
-        expected = {
-            "total_functions": 4,
-            "async_count": 3,
-            "sync_count": 1,
-            "async_names": ["simple_async", "async_with_params", "async_generator"],
-            "sync_names": ["regular_function"]
-        }
-        
-        actual = {
-            "total_functions": len(functions),
-            "async_count": len(async_functions),
-            "sync_count": len(sync_functions),
-            "async_names": [f.name for f in async_functions],
-            "sync_names": [f.name for f in sync_functions]
-        }
-        
-        passed = (
-            len(functions) == 4 and
-            len(async_functions) == 3 and
-            len(sync_functions) == 1 and
-            set(f.name for f in async_functions) == {"simple_async", "async_with_params", "async_generator"} and
-            set(f.name for f in sync_functions) == {"regular_function"}
-        )
-        
-        reporter.record_result("detect_async_functions", expected, actual, passed)
-        assert passed
-    
-    def test_detect_class_methods_comprehensive(self):
-        """Test detecting methods in classes with various decorators and patterns."""
-        python_code = '''
+_ASYNC_FUNCTION_NAMES = frozenset({"simple_async", "async_with_params", "async_generator"})
+_SYNC_FUNCTION_NAMES = frozenset({"regular_function"})
+
+_CLASS_METHODS_SOURCE = '''
 class ComprehensiveClass:
     """A class with various types of methods."""
     
@@ -275,55 +210,8 @@ class ComprehensiveClass:
         """Property with multiple decorators."""
         return "deprecated"
 '''
-        detector = PythonFunctionDetector()
-        functions = detector.detect_functions(python_code)
-        
-        # Filter methods only
-        methods = [f for f in functions if f.is_method and f.class_name == "ComprehensiveClass"]
-        
-        # Categorize by decorator types
-        property_methods = [f for f in methods if "property" in f.decorator_names]
-        classmethod_methods = [f for f in methods if "classmethod" in f.decorator_names]
-        staticmethod_methods = [f for f in methods if "staticmethod" in f.decorator_names]
-        async_methods = [f for f in methods if f.is_async]
-        regular_methods = [f for f in methods if not f.decorator_names and not f.is_async]
-        
-        expected = {
-            "total_methods": 9,
-            "property_count": 3,  # current_value getter, setter, old_property
-            "classmethod_count": 1,
-            "staticmethod_count": 1,
-            "async_count": 1,
-            "regular_count": 4,  # __init__, regular_method, _private_method, setter
-            "all_belong_to_class": True
-        }
-        
-        actual = {
-            "total_methods": len(methods),
-            "property_count": len(property_methods),
-            "classmethod_count": len(classmethod_methods),
-            "staticmethod_count": len(staticmethod_methods),
-            "async_count": len(async_methods),
-            "regular_count": len(regular_methods),
-            "all_belong_to_class": all(m.class_name == "ComprehensiveClass" for m in methods)
-        }
-        
-        passed = (
-            len(methods) == 9 and
-            len(property_methods) == 3 and
-            len(classmethod_methods) == 1 and
-            len(staticmethod_methods) == 1 and
-            len(async_methods) == 1 and
-            all(m.class_name == "ComprehensiveClass" for m in methods) and
-            all(m.is_method for m in methods)
-        )
-        
-        reporter.record_result("detect_class_methods_comprehensive", expected, actual, passed)
-        assert passed
-    
-    def test_detect_nested_functions_and_classes(self):
-        """Test detecting nested functions and classes."""
-        python_code = '''
+
+_NESTED_DEFINITIONS_SOURCE = '''
 def outer_function(data):
     """Outer function with nested components."""
     
@@ -364,14 +252,236 @@ class OuterClass:
         
         return nested_in_method()
 '''
-        detector = PythonFunctionDetector()
-        functions = detector.detect_functions(python_code)
+
+_NESTED_FUNCTION_NAMES = frozenset({"inner_function", "inner_async", "nested_in_method"})
+
+_COMPOUND_STATEMENTS_SOURCE = '''
+if TYPE_CHECKING:
+    def in_if():
+        pass
+else:
+    def in_else():
+        pass
+
+try:
+    def in_try():
+        pass
+except ImportError:
+    def in_except():
+        pass
+finally:
+    def in_finally():
+        pass
+
+class Config:
+    with lock:
+        def in_with(self):
+            pass
+    match mode:
+        case "fast":
+            def in_case(self):
+                pass
+'''
+
+_LINE_LOOKUP_SOURCE = '''def function_one():
+    x = 1
+    y = 2
+    return x + y
+
+def function_two():
+    z = 3
+    w = 4
+    return z * w
+
+class Calculator:
+    def add(self, a, b):
+        result = a + b
+        return result
+    
+    def multiply(self, a, b):
+        result = a * b
+        return result
+'''
+
+_NESTED_LINE_LOOKUP_SOURCE = '''
+def outer():
+    def first_inner():
+        return 1
+
+    def second_inner():
+        def innermost():
+            return 2
+        return innermost()
+
+    return first_inner() + second_inner()
+
+def after():
+    pass
+'''
+
+_CACHE_SOURCE = '''
+def first():
+    return 1
+
+def second():
+    return 2
+'''
+
+# (name, source, lines, expected functions, outermost first)
+_LINE_LOOKUP_CASES = [
+    ("function_one", _LINE_LOOKUP_SOURCE, [3], ["function_one"]),
+    ("function_two", _LINE_LOOKUP_SOURCE, [8], ["function_two"]),
+    ("method_add", _LINE_LOOKUP_SOURCE, [13], ["add"]),
+    ("method_multiply", _LINE_LOOKUP_SOURCE, [17], ["multiply"]),
+    ("two_functions", _LINE_LOOKUP_SOURCE, [3, 8], ["function_one", "function_two"]),
+    ("two_methods", _LINE_LOOKUP_SOURCE, [13, 17], ["add", "multiply"]),
+    ("outside_any_function", _LINE_LOOKUP_SOURCE, [100], []),
+    # Lines in nested functions report every enclosing function
+    ("nested_first_inner", _NESTED_LINE_LOOKUP_SOURCE, [4], ["outer", "first_inner"]),
+    ("nested_innermost", _NESTED_LINE_LOOKUP_SOURCE, [8], ["outer", "second_inner", "innermost"]),
+    ("nested_second_inner", _NESTED_LINE_LOOKUP_SOURCE, [9], ["outer", "second_inner"]),
+    ("nested_outer", _NESTED_LINE_LOOKUP_SOURCE, [11], ["outer"]),
+    ("nested_and_after", _NESTED_LINE_LOOKUP_SOURCE, [8, 14], ["outer", "second_inner", "innermost", "after"]),
+    ("nested_outside", _NESTED_LINE_LOOKUP_SOURCE, [1, 12], []),
+]
+
+_INVALID_SOURCES = [
+    ("missing_parenthesis", "def incomplete_function("),
+    ("indentation_error", "def function():\nreturn x\n  return y"),
+    ("missing_colon", "class Class\n  def method():\n    pass"),
+    ("empty_string", ""),
+    ("not_python", "not python code at all"),
+]
+
+
+class TestPythonFunctionDetector:
+    """Enhanced test cases for Python function detection."""
+    
+    def test_detect_simple_functions(self, detector):
+        """Test detecting simple Python functions."""
+        functions = detector.detect_functions(_SIMPLE_FUNCTIONS_SOURCE)
+        
+        expected = {
+            "function_count": 2,
+            "function_names": _SIMPLE_FUNCTION_NAMES,
+            "all_are_functions": True,
+            "none_are_methods": True
+        }
         
-        # Categorize functions
-        outer_level = [f for f in functions if f.class_name is None and f.name == "outer_function"]
-        inner_functions = [f for f in functions if f.class_name is None and f.name in ["inner_function", "inner_async", "nested_in_method"]]
-        outer_class_methods = [f for f in functions if f.class_name == "OuterClass"]
-        inner_class_methods = [f for f in functions if f.class_name == "InnerClass"]
+        function_names = {func.name for func in functions}
+        actual = {
+            "function_count": len(functions),
+            "function_names": function_names,
+            "all_are_functions": all(not func.is_method for func in functions),
+            "none_are_methods": all(func.class_name is None for func in functions)
+        }
+        
+        passed = actual == expected
+        
+        reporter.record_result("detect_simple_functions", expected, actual, passed)
+        assert passed
+    
+    def test_detect_async_functions(self, detector):
+        """Test detecting async functions with various patterns."""
+        functions = detector.detect_functions(_ASYNC_FUNCTIONS_SOURCE)
+        
+        async_functions = [f for f in functions if f.is_async]
+        sync_functions = [f for f in functions if not f.is_async]
+        async_names = {f.name for f in async_functions}
+        sync_names = {f.name for f in sync_functions}
+        
+        expected = {
+            "total_functions": 4,
+            "async_count": 3,
+            "sync_count": 1,
+            "async_names": _ASYNC_FUNCTION_NAMES,
+            "sync_names": _SYNC_FUNCTION_NAMES
+        }
+        
+        actual = {
+            "total_functions": len(functions),
+            "async_count": len(async_functions),
+            "sync_count": len(sync_functions),
+            "async_names": async_names,
+            "sync_names": sync_names
+        }
+        
+        passed = actual == expected
+        
+        reporter.record_result("detect_async_functions", expected, actual, passed)
+        assert passed
+    
+    def test_detect_class_methods_comprehensive(self, detector):
+        """Test detecting methods in classes with various decorators and patterns."""
+        functions = detector.detect_functions(_CLASS_METHODS_SOURCE)
+        
+        # Count the class's methods by decorator type in a single pass
+        total = property_count = classmethod_count = staticmethod_count = async_count = regular_count = 0
+        all_belong_to_class = True
+        for f in functions:
+            if not f.is_method:
+                continue
+            if f.class_name != "ComprehensiveClass":
+                all_belong_to_class = False
+                continue
+            total += 1
+            decorators = f.decorator_names
+            if "property" in decorators:
+                property_count += 1
+            if "classmethod" in decorators:
+                classmethod_count += 1
+            if "staticmethod" in decorators:
+                staticmethod_count += 1
+            if f.is_async:
+                async_count += 1
+            elif not decorators:
+                regular_count += 1
+        
+        expected = {
+            "total_methods": 9,
+            "property_count": 3,  # current_value getter, setter, old_property
+            "classmethod_count": 1,
+            "staticmethod_count": 1,
+            "async_count": 1,
+            "regular_count": 3,  # __init__, regular_method, _private_method (the setter counts as a property)
+            "all_belong_to_class": True
+        }
+        
+        actual = {
+            "total_methods": total,
+            "property_count": property_count,
+            "classmethod_count": classmethod_count,
+            "staticmethod_count": staticmethod_count,
+            "async_count": async_count,
+            "regular_count": regular_count,
+            "all_belong_to_class": all_belong_to_class
+        }
+        
+        passed = actual == expected
+        
+        reporter.record_result("detect_class_methods_comprehensive", expected, actual, passed)
+        assert passed
+    
+    def test_detect_nested_functions_and_classes(self, detector):
+        """Test detecting nested functions and classes."""
+        functions = detector.detect_functions(_NESTED_DEFINITIONS_SOURCE)
+        
+        # Categorize functions in a single pass
+        outer_function_count = nested_function_count = async_nested_count = 0
+        outer_class_method_count = inner_class_method_count = 0
+        for f in functions:
+            class_name = f.class_name
+            if class_name is None:
+                if f.name == "outer_function":
+                    outer_function_count += 1
+                elif f.name in _NESTED_FUNCTION_NAMES:
+                    nested_function_count += 1
+                    if f.is_async:
+                        async_nested_count += 1
+            elif class_name == "OuterClass":
+                outer_class_method_count += 1
+            elif class_name == "InnerClass":
+                inner_class_method_count += 1
         
         expected = {
             "total_functions": 7,
@@ -382,144 +492,167 @@ class OuterClass:
             "async_nested_count": 1
         }
         
-        async_nested = [f for f in inner_functions if f.is_async]
-        
         actual = {
             "total_functions": len(functions),
-            "outer_function_count": len(outer_level),
-            "nested_function_count": len(inner_functions),
-            "outer_class_method_count": len(outer_class_methods),
-            "inner_class_method_count": len(inner_class_methods),
-            "async_nested_count": len(async_nested)
+            "outer_function_count": outer_function_count,
+            "nested_function_count": nested_function_count,
+            "outer_class_method_count": outer_class_method_count,
+            "inner_class_method_count": inner_class_method_count,
+            "async_nested_count": async_nested_count
         }
         
-        passed = (
-            len(functions) == 7 and
-            len(outer_level) == 1 and
-            len(inner_functions) == 3 and
-            len(outer_class_methods) == 1 and
-            len(inner_class_methods) == 2 and
-            len(async_nested) == 1
-        )
+        passed = actual == expected
         
         reporter.record_result("detect_nested_functions_and_classes", expected, actual, passed)
         assert passed
     
-    def test_find_functions_at_specific_lines(self):
-        """Test finding functions that contain specific line numbers."""
-        python_code = '''def function_one():
-    x = 1
-    y = 2
-    return x + y
-
-def function_two():
-    z = 3
-    w = 4
-    return z * w
-
-class Calculator:
-    def add(self, a, b):
-        result = a + b
-        return result
-    
-    def multiply(self, a, b):
-        result = a * b
-        return result
-'''
-        detector = PythonFunctionDetector()
+    def test_detect_functions_in_compound_statements(self, detector):
+        """Test detecting functions defined inside if/try/with/match blocks."""
+        functions = detector.detect_functions(_COMPOUND_STATEMENTS_SOURCE)
         
-        test_cases = [
-            {"lines": [3], "expected_functions": ["function_one"]},
-            {"lines": [8], "expected_functions": ["function_two"]},
-            {"lines": [13], "expected_functions": ["add"]},
-            {"lines": [17], "expected_functions": ["multiply"]},
-            {"lines": [3, 8], "expected_functions": ["function_one", "function_two"]},
-            {"lines": [13, 17], "expected_functions": ["add", "multiply"]},
-            {"lines": [100], "expected_functions": []},  # Line outside any function
+        expected = [
+            ("in_if", None), ("in_else", None), ("in_try", None), ("in_except", None),
+            ("in_finally", None), ("in_with", "Config"), ("in_case", "Config")
         ]
+        actual = [(f.name, f.class_name) for f in functions]
+        passed = expected == actual
         
-        all_passed = True
-        for i, test_case in enumerate(test_cases):
-            functions = detector.find_functions_at_lines(python_code, test_case["lines"])
-            found_names = [f.name for f in functions]
-            expected_names = test_case["expected_functions"]
-            
-            case_passed = set(found_names) == set(expected_names)
-            all_passed = all_passed and case_passed
-            
+        reporter.record_result("detect_functions_in_compound_statements", expected, actual, passed)
+        assert passed
+        
+    @pytest.mark.parametrize("name, source, lines, expected", _LINE_LOOKUP_CASES,
+                             ids=[case[0] for case in _LINE_LOOKUP_CASES])
+    def test_find_functions_at_lines(self, detector, name, source, lines, expected):
+        """Test finding the functions, including enclosing ones, that contain given line numbers."""
+        found_names = [f.name for f in detector.find_functions_at_lines(source, lines)]
+        passed = found_names == expected
+        
+        reporter.record_result(
+            f"find_functions_at_lines_{name}",
+            {"lines": lines, "expected": expected},
+            {"lines": lines, "found": found_names},
+            passed
+        )
+        
+        assert passed
+    
+    @pytest.mark.parametrize("name, code", _INVALID_SOURCES, ids=[case[0] for case in _INVALID_SOURCES])
+    def test_detect_functions_with_syntax_errors(self, detector, name, code):
+        """Test that code with syntax errors yields no functions instead of raising."""
+        test_name = f"syntax_error_handling_{name}"
+        try:
+            functions = detector.detect_functions(code)
+        except Exception as e:
             reporter.record_result(
-                f"find_functions_at_lines_case_{i+1}",
-                {"lines": test_case["lines"], "expected": expected_names},
-                {"lines": test_case["lines"], "found": found_names},
-                case_passed
+                test_name,
+                {"functions_found": 0, "error_handled": True},
+                {"error_raised": str(e), "error_handled": False},
+                False,
+                e
             )
+            raise
         
-        assert all_passed
-    
-    def test_detect_functions_with_syntax_errors(self):
-        """Test handling of Python code with syntax errors."""
-        invalid_python_codes = [
-            "def incomplete_function(",  # Missing closing parenthesis
-            "def function():\nreturn x\n  return y",  # Indentation error
-            "class Class\n  def method():\n    pass",  # Missing colon
-            "",  # Empty string
-            "not python code at all",  # Not Python
-        ]
+        # Should return empty list for invalid code
+        passed = len(functions) == 0
+        
+        reporter.record_result(
+            test_name,
+            {"functions_found": 0, "error_handled": True},
+            {"functions_found": len(functions), "error_handled": True},
+            passed
+        )
         
+        assert passed
+    
+    def test_detect_functions_cache(self):
+        """Test that repeated detection and line lookups of the same content are served from the cache, as copies."""
         detector = PythonFunctionDetector()
         
-        all_handled_gracefully = True
-        for i, code in enumerate(invalid_python_codes):
-            try:
-                functions = detector.detect_functions(code)
-                # Should return empty list for invalid code
-                case_passed = len(functions) == 0
-                
-                reporter.record_result(
-                    f"syntax_error_handling_case_{i+1}",
-                    {"functions_found": 0, "error_handled": True},
-                    {"functions_found": len(functions), "error_handled": True},
-                    case_passed
-                )
-                
-                all_handled_gracefully = all_handled_gracefully and case_passed
-                
-            except Exception as e:
-                reporter.record_result(
-                    f"syntax_error_handling_case_{i+1}",
-                    {"functions_found": 0, "error_handled": True},
-                    {"error_raised": str(e), "error_handled": False},
-                    False,
-                    e
-                )
-                all_handled_gracefully = False
+        first_result = detector.detect_functions(_CACHE_SOURCE)
+        first_result.clear()  # Mutating a returned list must not affect the cache
+        second_result = detector.detect_functions(_CACHE_SOURCE)
+        second_names = [f.name for f in second_result]
+        # Neither must mutating the returned functions themselves
+        second_result[1].name = "renamed"
+        second_result[1].decorator_names.append("injected")
+        changed_result = detector.detect_functions(_CACHE_SOURCE.replace("second", "third"))
+        # Line lookups on already-detected content use the same cached index
+        at_lines = detector.find_functions_at_lines(_CACHE_SOURCE, [6])
+        # Looking up no lines doesn't parse (or cache) new content at all
+        no_lines = detector.find_functions_at_lines("def uncached():\n    pass\n", [])
+        at_lines[0].end_line = 0
+        after_mutation = detector.detect_functions(_CACHE_SOURCE)
         
-        assert all_handled_gracefully
+        expected = {
+            "second_call": ["first", "second"],
+            "changed_content": ["first", "third"],
+            "at_lines": ["second"],
+            "no_lines": [],
+            "after_mutation": [("first", [], 3), ("second", [], 6)],
+            "cache_entries": 2
+        }
+        actual = {
+            "second_call": second_names,
+            "changed_content": [f.name for f in changed_result],
+            "at_lines": [f.name for f in at_lines],
+            "no_lines": no_lines,
+            "after_mutation": [(f.name, f.decorator_names, f.end_line) for f in after_mutation],
+            "cache_entries": len(detector._cache)
+        }
+        passed = expected == actual
+        
+        reporter.record_result("detect_functions_cache", expected, actual, passed)
+        assert passed
+    
+    def test_detect_functions_in_many_files(self, tmp_path):
+        """Test that pooled and async detection across files match serial detection."""
+        temp_dir = str(tmp_path)
+        paths = []
+        for i in range(4):
+            path = os.path.join(temp_dir, f"module_{i}.py")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"def function_{i}():\n    return {i}\n\nclass Class{i}:\n    def method(self):\n        pass\n")
+            paths.append(path)
+        paths.append(os.path.join(temp_dir, "missing.py"))
+        
+        # Run the async version first so its reads aren't served from the file cache
+        concurrent = asyncio.run(detect_python_functions_in_files_async(paths))
+        serial = detect_python_functions_in_files(paths, max_workers=1)
+        pooled = detect_python_functions_in_files(paths, max_workers=2)
+        pooled_matches_serial = pooled == serial
+        async_matches_serial = concurrent == serial
+        
+        # Results served from the file cache are copies, so changing one doesn't leak into the next
+        serial[paths[0]][0].name = "renamed"
+        served_again = detect_python_functions_in_files(paths[:1], max_workers=1)
+        
+        expected = {
+            "paths": paths,
+            "names": [[f"function_{i}", "method"] for i in range(4)] + [[]],
+            "pooled_matches_serial": True,
+            "async_matches_serial": True,
+            "served_again": ["function_0", "method"]
+        }
+        actual = {
+            "paths": list(pooled),
+            "names": [[f.name for f in functions] for functions in pooled.values()],
+            "pooled_matches_serial": pooled_matches_serial,
+            "async_matches_serial": async_matches_serial,
+            "served_again": [f.name for f in served_again[paths[0]]]
+        }
+        passed = expected == actual
+        
+        reporter.record_result("detect_functions_in_many_files", expected, actual, passed)
+        assert passed
 
 
-class TestFunctionAwareDiffParser:
-    """Enhanced test cases for function-aware diff parsing."""
-    
-    def test_parse_diff_with_function_addition(self):
-        """Test parsing diff that adds new Python functions."""
-        temp_dir = tempfile.mkdtemp()
-        try:
-            repo = Repo.init(temp_dir)
-            repo.config_writer().set_value("user", "name", "Test User").release()
-            repo.config_writer().set_value("user", "email", "test@example.com").release()
-            
-            # Initial Python file
-            python_file = Path(temp_dir) / "math_utils.py"
-            python_file.write_text('''def add(a, b):
+# Before and after contents for the two-commit diff tests
+_MATH_UTILS_BEFORE = '''def add(a, b):
     """Add two numbers."""
     return a + b
-''')
-            
-            repo.index.add([str(python_file)])
-            first_commit = repo.index.commit("Initial commit")
-            
-            # Add new functions
-            python_file.write_text('''def add(a, b):
+'''
+
+_MATH_UTILS_AFTER = '''def add(a, b):
     """Add two numbers."""
     return a + b
 
@@ -531,6 +664,14 @@ async def multiply_async(a, b):
     """Async multiplication."""
     return a * b
 
+def first[T](items: list[T]) -> T:
+    """Generic function with a type parameter."""
+    return items[0]
+
+async def fetch_first[T](items: list[T]) -> T:
+    """Generic async function."""
+    return items[0]
+
 class Calculator:
     """Calculator class."""
     
@@ -539,77 +680,10 @@ class Calculator:
         if b == 0:
             raise ValueError("Cannot divide by zero")
         return a / b
-''')
-            
-            repo.index.add([str(python_file)])
-            second_commit = repo.index.commit("Add new functions and class")
-            
-            # Parse the diff
-            diff_text = get_commit_diff(temp_dir, second_commit.hexsha)
-            enhanced_changes = parse_git_diff_with_functions(diff_text, temp_dir)
-            
-            assert len(enhanced_changes) == 1
-            change = enhanced_changes[0]
-            
-            expected = {
-                "is_python_file": True,
-                "total_functions_detected": 4,  # add, subtract, multiply_async, divide
-                "function_changes_count": 3,    # subtract, multiply_async, divide (add is unchanged)
-                "added_functions": ["subtract", "multiply_async", "divide"],
-                "has_async_function": True,
-                "has_class_method": True
-            }
-            
-            function_names = [f.name for f in change.detected_functions]
-            function_change_names = [fc.function.name for fc in change.function_changes]
-            added_functions = [fc.function.name for fc in change.function_changes if fc.change_type == "added"]
-            has_async = any(f.is_async for f in change.detected_functions)
-            has_method = any(f.is_method for f in change.detected_functions)
-            
-            actual = {
-                "is_python_file": change.is_python_file,
-                "total_functions_detected": len(change.detected_functions),
-                "function_changes_count": len(change.function_changes),
-                "added_functions": added_functions,
-                "has_async_function": has_async,
-                "has_class_method": has_method
-            }
-            
-            passed = (
-                change.is_python_file and
-                len(change.detected_functions) == 4 and
-                len(change.function_changes) >= 3 and  # Allow for slight variations in parsing
-                set(added_functions).issuperset({"subtract", "multiply_async", "divide"}) and
-                has_async and
-                has_method
-            )
-            
-            reporter.record_result("parse_diff_with_function_addition", expected, actual, passed)
-            assert passed
-            
-        except Exception as e:
-            reporter.record_result(
-                "parse_diff_with_function_addition",
-                "Successful function addition detection",
-                f"Failed with error: {e}",
-                False,
-                e
-            )
-            raise
-        finally:
-            safe_cleanup(temp_dir)
-    
-    def test_parse_diff_with_function_modification(self):
-        """Test parsing diff that modifies existing Python functions."""
-        temp_dir = tempfile.mkdtemp()
-        try:
-            repo = Repo.init(temp_dir)
-            repo.config_writer().set_value("user", "name", "Test User").release()
-            repo.config_writer().set_value("user", "email", "test@example.com").release()
-            
-            # Initial Python file with multiple functions
-            python_file = Path(temp_dir) / "service.py"
-            python_file.write_text('''def process_data(data):
+'''
+_MATH_UTILS_ADDED = frozenset({"subtract", "multiply_async", "first", "fetch_first", "divide"})
+
+_SERVICE_BEFORE = '''def process_data(data):
     """Process the input data."""
     return data.upper()
 
@@ -628,13 +702,9 @@ class DataProcessor:
         result = item * 2
         self.processed_count += 1
         return result
-''')
-            
-            repo.index.add([str(python_file)])
-            first_commit = repo.index.commit("Initial commit")
-            
-            # Modify existing functions
-            python_file.write_text('''def process_data(data):
+'''
+
+_SERVICE_AFTER = '''def process_data(data):
     """Process the input data with validation."""
     if not data:
         raise ValueError("Data cannot be empty")
@@ -668,25 +738,90 @@ class DataProcessor:
     def reset(self):
         """Reset the processor state."""
         self.processed_count = 0
-''')
+'''
+_SERVICE_MODIFIED = frozenset({"process_data", "validate_input", "__init__", "process"})
+_SERVICE_ADDED = frozenset({"reset"})
+
+
+class TestFunctionAwareDiffParser:
+    """Enhanced test cases for function-aware diff parsing."""
+    
+    def test_parse_diff_with_function_addition(self, two_commit_diff):
+        """Test parsing diff that adds new Python functions."""
+        try:
+            enhanced_changes = two_commit_diff("math_utils.py", _MATH_UTILS_BEFORE, _MATH_UTILS_AFTER)
             
-            repo.index.add([str(python_file)])
-            second_commit = repo.index.commit("Enhance functions with validation")
+            assert len(enhanced_changes) == 1
+            change = enhanced_changes[0]
             
-            # Parse the diff
-            diff_text = get_commit_diff(temp_dir, second_commit.hexsha)
-            enhanced_changes = parse_git_diff_with_functions(diff_text, temp_dir)
+            expected = {
+                "is_python_file": True,
+                "total_functions_detected": 6,  # add, subtract, multiply_async, first, fetch_first, divide
+                "function_changes_count": 5,    # all but add, which is unchanged
+                "added_functions": _MATH_UTILS_ADDED,
+                "has_async_function": True,
+                "has_class_method": True,
+                "hunk_scan_functions": _MATH_UTILS_ADDED
+            }
+            
+            added_functions = {fc.function.name for fc in change.function_changes if fc.change_type == "added"}
+            has_async = any(f.is_async for f in change.detected_functions)
+            has_method = any(f.is_method for f in change.detected_functions)
+            # The added "def" lines, found by scanning the hunks alone as when the file can't be parsed
+            hunk_scan_functions = {
+                f.name
+                for hunk in change.hunks
+                for f in FunctionAwareDiffParser()._detect_new_functions_in_hunk(hunk, [])
+            }
+            
+            actual = {
+                "is_python_file": change.is_python_file,
+                "total_functions_detected": len(change.detected_functions),
+                "function_changes_count": len(change.function_changes),
+                "added_functions": added_functions,
+                "has_async_function": has_async,
+                "has_class_method": has_method,
+                "hunk_scan_functions": hunk_scan_functions
+            }
+            
+            passed = (
+                change.is_python_file and
+                len(change.detected_functions) == 6 and
+                len(change.function_changes) >= 5 and  # Allow for slight variations in parsing
+                added_functions >= _MATH_UTILS_ADDED and
+                has_async and
+                has_method and
+                hunk_scan_functions == _MATH_UTILS_ADDED
+            )
+            
+            reporter.record_result("parse_diff_with_function_addition", expected, actual, passed)
+            assert passed
+            
+        except Exception as e:
+            reporter.record_result(
+                "parse_diff_with_function_addition",
+                "Successful function addition detection",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+    
+    def test_parse_diff_with_function_modification(self, two_commit_diff):
+        """Test parsing diff that modifies existing Python functions."""
+        try:
+            enhanced_changes = two_commit_diff("service.py", _SERVICE_BEFORE, _SERVICE_AFTER)
             
             assert len(enhanced_changes) == 1
             change = enhanced_changes[0]
             
-            modified_functions = [fc.function.name for fc in change.function_changes if fc.change_type == "modified"]
-            added_functions = [fc.function.name for fc in change.function_changes if fc.change_type == "added"]
+            modified_functions = {fc.function.name for fc in change.function_changes if fc.change_type == "modified"}
+            added_functions = {fc.function.name for fc in change.function_changes if fc.change_type == "added"}
             
             expected = {
                 "total_detected_functions": 5,  # process_data, validate_input, __init__, process, reset
-                "modified_functions": ["process_data", "validate_input", "__init__", "process"],
-                "added_functions": ["reset"],
+                "modified_functions": _SERVICE_MODIFIED,
+                "added_functions": _SERVICE_ADDED,
                 "has_modifications": True,
                 "has_additions": True
             }
@@ -702,8 +837,7 @@ class DataProcessor:
             passed = (
                 len(change.detected_functions) == 5 and
                 len(modified_functions) >= 3 and  # At least process_data, validate_input, and one method
-                "reset" in added_functions and
-                len(change.function_changes) > 0
+                "reset" in added_functions
             )
             
             reporter.record_result("parse_diff_with_function_modification", expected, actual, passed)
@@ -718,17 +852,11 @@ class DataProcessor:
                 e
             )
             raise
-        finally:
-            safe_cleanup(temp_dir)
     
-    def test_parse_diff_mixed_file_types(self):
+    def test_parse_diff_mixed_file_types(self, empty_git_repo):
         """Test parsing diff with both Python and non-Python files."""
-        temp_dir = tempfile.mkdtemp()
+        temp_dir, repo = empty_git_repo
         try:
-            repo = Repo.init(temp_dir)
-            repo.config_writer().set_value("user", "name", "Test User").release()
-            repo.config_writer().set_value("user", "email", "test@example.com").release()
-            
             # Create multiple file types
             python_file = Path(temp_dir) / "module.py"
             python_file.write_text('''def hello():
@@ -742,7 +870,7 @@ class DataProcessor:
             txt_file.write_text("Initial readme content")
             
             repo.index.add([str(python_file), str(js_file), str(txt_file)])
-            first_commit = repo.index.commit("Initial commit")
+            first_commit = repo.index.commit("Initial commit", skip_hooks=True)
             
             # Modify all files
             python_file.write_text('''def hello():
@@ -758,10 +886,10 @@ function goodbye() { return "Goodbye"; }''')
             txt_file.write_text("Updated readme content with more information")
             
             repo.index.add([str(python_file), str(js_file), str(txt_file)])
-            second_commit = repo.index.commit("Update all files")
+            second_commit = repo.index.commit("Update all files", skip_hooks=True)
             
             # Parse the diff
-            diff_text = get_commit_diff(temp_dir, second_commit.hexsha)
+            diff_text = get_commit_diff(temp_dir, second_commit.hexsha, first_commit.hexsha)
             enhanced_changes = parse_git_diff_with_functions(diff_text, temp_dir)
             
             python_changes = [c for c in enhanced_changes if c.is_python_file]
@@ -783,13 +911,7 @@ function goodbye() { return "Goodbye"; }''')
                 "non_python_functions_detected": any(len(c.detected_functions) > 0 for c in non_python_changes)
             }
             
-            passed = (
-                len(enhanced_changes) == 3 and
-                len(python_changes) == 1 and
-                len(non_python_changes) == 2 and
-                len(python_changes[0].detected_functions) > 0 and
-                all(len(c.detected_functions) == 0 for c in non_python_changes)
-            )
+            passed = actual == expected
             
             reporter.record_result("parse_diff_mixed_file_types", expected, actual, passed)
             assert passed
@@ -803,17 +925,237 @@ function goodbye() { return "Goodbye"; }''')
                 e
             )
             raise
-        finally:
-            safe_cleanup(temp_dir)
     
-    def test_parse_diff_edge_cases(self):
-        """Test parsing diff with edge cases."""
-        temp_dir = tempfile.mkdtemp()
+    def test_parse_diff_reuses_cached_detection(self, empty_git_repo):
+        """Test that re-parsing an unchanged file reuses the cached detection, through a parser or the convenience function."""
+        temp_dir, repo = empty_git_repo
         try:
-            repo = Repo.init(temp_dir)
-            repo.config_writer().set_value("user", "name", "Test User").release()
-            repo.config_writer().set_value("user", "email", "test@example.com").release()
+            python_file = Path(temp_dir) / "cached.py"
+            python_file.write_text('''def first():
+    return 1
+''')
+            repo.index.add([str(python_file)])
+            first_commit = repo.index.commit("Initial commit", skip_hooks=True)
+
+            python_file.write_text('''def first():
+    return 1
+
+def second():
+    return 2
+''')
+            repo.index.add([str(python_file)])
+            second_commit = repo.index.commit("Add second", skip_hooks=True)
+
+            diff_text = get_commit_diff(temp_dir, second_commit.hexsha, first_commit.hexsha)
+            parser = FunctionAwareDiffParser()
+            first_run = parser.parse_diff_with_functions(diff_text, temp_dir)
+            second_run = parser.parse_diff_with_functions(diff_text, temp_dir)
+            identical_results = first_run == second_run
+
+            # Results are copies of the cached detection, so editing one doesn't change the next
+            first_run[0].detected_functions[0].name = "renamed"
+            first_run[0].detected_functions[1].decorator_names.append("injected")
+            third_run = parser.parse_diff_with_functions(diff_text, temp_dir)
+
+            # The convenience function keeps one parser, so it reuses detections across calls too
+            first_convenience = parse_git_diff_with_functions(diff_text, temp_dir)
+            second_convenience = parse_git_diff_with_functions(diff_text, temp_dir)
+            convenience_reused = any(
+                key[0] == str(python_file) for key in function_aware_diff._default_parser._detect_cache
+            )
             
+            # Resetting drops the shared parser, and the next call builds a fresh one
+            shared_parser = function_aware_diff._default_parser
+            reset_default_parser()
+            after_reset = parse_git_diff_with_functions(diff_text, temp_dir)
+            reset_to_fresh_parser = function_aware_diff._default_parser is not shared_parser
+
+            expected = {"cache_entries": 1, "identical_results": True, "unaffected_by_edits": True, "convenience_reused": True,
+                        "reset_to_fresh_parser": True}
+            actual = {
+                "cache_entries": len(parser._detect_cache),
+                "identical_results": identical_results,
+                "unaffected_by_edits": third_run == second_run,
+                "convenience_reused": convenience_reused,
+                "reset_to_fresh_parser": reset_to_fresh_parser
+            }
+
+            passed = (
+                actual == expected and
+                [f.name for f in second_run[0].detected_functions] == ["first", "second"] and
+                second_convenience == second_run and
+                after_reset == second_run
+            )
+
+            reporter.record_result("parse_diff_reuses_cached_detection", expected, actual, passed)
+            assert passed
+
+        except Exception as e:
+            reporter.record_result(
+                "parse_diff_reuses_cached_detection",
+                "Cached detection reused",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+
+    def test_parse_diff_with_functions_async(self, empty_git_repo):
+        """Test that the async prefetching parser matches the synchronous parser."""
+        temp_dir, repo = empty_git_repo
+        try:
+            files = [Path(temp_dir) / name for name in ("alpha.py", "beta.py", "notes.txt")]
+            for path in files:
+                path.write_text("def original():\n    return 0\n")
+            repo.index.add([str(path) for path in files])
+            first_commit = repo.index.commit("Initial commit", skip_hooks=True)
+
+            for path in files:
+                path.write_text("def original():\n    return 1\n\ndef extra():\n    return 2\n")
+            repo.index.add([str(path) for path in files])
+            second_commit = repo.index.commit("Modify all files", skip_hooks=True)
+
+            diff_text = get_commit_diff(temp_dir, second_commit.hexsha, first_commit.hexsha)
+            sync_changes = FunctionAwareDiffParser().parse_diff_with_functions(diff_text, temp_dir)
+            async_changes = asyncio.run(
+                FunctionAwareDiffParser().parse_diff_with_functions_async(diff_text, temp_dir)
+            )
+
+            expected = {"file_count": 3, "identical_results": True}
+            actual = {"file_count": len(async_changes), "identical_results": async_changes == sync_changes}
+
+            passed = len(async_changes) == 3 and async_changes == sync_changes
+
+            reporter.record_result("parse_diff_with_functions_async", expected, actual, passed)
+            assert passed
+
+        except Exception as e:
+            reporter.record_result(
+                "parse_diff_with_functions_async",
+                "Async parse matches sync parse",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+
+    def test_parse_diff_with_process_pool(self, empty_git_repo):
+        """Test that enhancing files in a process pool matches the serial parser."""
+        temp_dir, repo = empty_git_repo
+        try:
+            files = [Path(temp_dir) / name for name in ("one.py", "readme.txt", "two.py", "three.py")]
+            for path in files:
+                path.write_text("def original():\n    return 0\n")
+            repo.index.add([str(path) for path in files])
+            first_commit = repo.index.commit("Initial commit", skip_hooks=True)
+
+            for path in files:
+                path.write_text("def original():\n    return 1\n\ndef extra():\n    return 2\n")
+            repo.index.add([str(path) for path in files])
+            second_commit = repo.index.commit("Modify all files", skip_hooks=True)
+
+            diff_text = get_commit_diff(temp_dir, second_commit.hexsha, first_commit.hexsha)
+            serial_changes = FunctionAwareDiffParser().parse_diff_with_functions(diff_text, temp_dir)
+            pooled_changes = FunctionAwareDiffParser(max_workers=2, parallel_threshold=1).parse_diff_with_functions(
+                diff_text, temp_dir
+            )
+
+            expected = {"file_order": [c.file_path for c in serial_changes], "identical_results": True}
+            actual = {"file_order": [c.file_path for c in pooled_changes], "identical_results": pooled_changes == serial_changes}
+
+            passed = len(pooled_changes) == 4 and pooled_changes == serial_changes
+
+            reporter.record_result("parse_diff_with_process_pool", expected, actual, passed)
+            assert passed
+
+        except Exception as e:
+            reporter.record_result(
+                "parse_diff_with_process_pool",
+                "Pooled parse matches serial parse",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+
+    def test_parse_diff_with_file_contents(self, empty_git_repo):
+        """Test that given file contents are used instead of the working tree, by every parse path."""
+        temp_dir, repo = empty_git_repo
+        try:
+            files = [Path(temp_dir) / name for name in ("given.py", "on_disk.py")]
+            for path in files:
+                path.write_text("def original():\n    return 0\n")
+            repo.index.add([str(path) for path in files])
+            first_commit = repo.index.commit("Initial commit", skip_hooks=True)
+
+            for path in files:
+                path.write_text("def original():\n    return 1\n")
+            repo.index.add([str(path) for path in files])
+            second_commit = repo.index.commit("Modify both files", skip_hooks=True)
+
+            # The working tree no longer matches the diffed commit for given.py
+            file_contents = {"given.py": "def original():\n    return 1\n\ndef in_memory():\n    return 2\n"}
+            diff_text = get_commit_diff(temp_dir, second_commit.hexsha, first_commit.hexsha)
+            results = {
+                "serial": parse_git_diff_with_functions(diff_text, temp_dir, file_contents),
+                "async": asyncio.run(
+                    FunctionAwareDiffParser().parse_diff_with_functions_async(diff_text, temp_dir, file_contents)
+                ),
+                "pooled": FunctionAwareDiffParser(max_workers=2, parallel_threshold=1).parse_diff_with_functions(
+                    diff_text, temp_dir, file_contents
+                )
+            }
+
+            expected = {mode: {"given.py": ["original", "in_memory"], "on_disk.py": ["original"]} for mode in results}
+            actual = {
+                mode: {c.file_path: [f.name for f in c.detected_functions] for c in changes}
+                for mode, changes in results.items()
+            }
+
+            passed = actual == expected
+
+            reporter.record_result("parse_diff_with_file_contents", expected, actual, passed)
+            assert passed
+
+        except Exception as e:
+            reporter.record_result(
+                "parse_diff_with_file_contents",
+                "Given file contents used by every parse path",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+
+    def test_map_hand_built_hunk(self):
+        """Test that a DiffHunk built without its added/removed counts still reports new functions."""
+        try:
+            # Another tool might fill in the lines and leave the counts at their defaults
+            hunk = DiffHunk(old_start=0, old_count=0, new_start=1, new_count=2,
+                            lines=["+def built_by_hand():", "+    return 1"])
+            changes = FunctionAwareDiffParser()._map_hunks_to_functions([hunk], [], "")
+            
+            expected = [("built_by_hand", "added")]
+            actual = [(fc.function.name, fc.change_type) for fc in changes]
+            passed = actual == expected
+            
+            reporter.record_result("map_hand_built_hunk", expected, actual, passed)
+            assert passed
+            
+        except Exception as e:
+            reporter.record_result(
+                "map_hand_built_hunk",
+                "New function found in a hand-built hunk",
+                f"Failed with error: {e}",
+                False,
+                e
+            )
+            raise
+    
+    def test_parse_diff_edge_cases(self, empty_git_repo):
+        """Test parsing diff with edge cases."""
+        temp_dir, repo = empty_git_repo
+        try:
             # Create file that will be deleted
             python_file = Path(temp_dir) / "to_delete.py"
             python_file.write_text('''def function_to_delete():
@@ -827,7 +1169,7 @@ function goodbye() { return "Goodbye"; }''')
 ''')
             
             repo.index.add([str(python_file), str(python_file2)])
-            first_commit = repo.index.commit("Initial commit")
+            first_commit = repo.index.commit("Initial commit", skip_hooks=True)
             
             # Delete first file
             python_file.unlink()
@@ -847,14 +1189,14 @@ def new_function():
             
             repo.index.remove([str(python_file), str(python_file2)])
             repo.index.add([str(new_name)])
-            second_commit = repo.index.commit("Delete, rename, and modify files")
+            second_commit = repo.index.commit("Delete, rename, and modify files", skip_hooks=True)
             
             # Parse the diff
-            diff_text = get_commit_diff(temp_dir, second_commit.hexsha)
+            diff_text = get_commit_diff(temp_dir, second_commit.hexsha, first_commit.hexsha)
             enhanced_changes = parse_git_diff_with_functions(diff_text, temp_dir)
             
             # This is complex - the parser should handle file operations gracefully
-            python_changes = [c for c in enhanced_changes if c.file_path.endswith('.py')]
+            python_files_processed = any(c.file_path.endswith('.py') for c in enhanced_changes)
             
             expected = {
                 "handled_gracefully": True,
@@ -864,7 +1206,7 @@ def new_function():
             
             actual = {
                 "handled_gracefully": len(enhanced_changes) > 0,
-                "python_files_processed": len(python_changes) > 0,
+                "python_files_processed": python_files_processed,
                 "no_exceptions_raised": True
             }
             
@@ -882,13 +1224,11 @@ def new_function():
                 e
             )
             raise
-        finally:
-            safe_cleanup(temp_dir)
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def print_test_summary():
-    """Print test summary after all tests complete."""
+    """Print test summary after all tests in the module (or xdist worker) complete."""
     yield
     reporter.print_summary()
 